@@ -1,8 +1,10 @@
-from fastapi import FastAPI
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 
-from app.core.config import Settings
-from app.core.database import register_database
 from app.api.routers import (
     announcements,
     auth,
@@ -12,20 +14,137 @@ from app.api.routers import (
     subscriptions,
     users,
 )
+from app.core.cache import TTLCache
+from app.core.config import Settings
+from app.core.database import register_database
+from app.core.metrics import (
+    CACHE_EVENTS,
+    CONTENT_TYPE,
+    QUEUE_DEPTH,
+    REGISTRY,
+    MetricsMiddleware,
+)
+from app.core.migrations import run_migrations
+from app.core.pagination import InvalidCursor
+from app.core.singleflight import SingleFlight
+from app.core.timing import RequestTimingMiddleware, instrument_queries
+from app.core.write_queue import WriteQueue
+from app.delivery import DeliveryWorker, build_senders
+from app.poller import SubscriptionPoller
+from app.services.announcement_service import AnnouncementService
+from app.services.notification_service import NotificationService
+from app.services.search_index import SearchIndex
+from app.services.swayam_service import SwayamService
 
 
 def create_app() -> FastAPI:
     settings = Settings()
-    app = FastAPI(title=settings.app_name, debug=settings.debug)
+    request_timing = bool(
+        settings.debug
+        or settings.request_timing_token
+        or settings.profile_sample_rate > 0
+    )
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+        await run_migrations()
+        if settings.metrics_enabled or request_timing:
+            instrument_queries()
+
+        swayam_service = SwayamService(settings)
+        await swayam_service.open()
+        app.state.swayam_service = swayam_service
+        app.state.search_cache = TTLCache[str, tuple[str, ...]](
+            max_entries=settings.search_cache_max_entries,
+            ttl_seconds=settings.cache_ttl_minutes * 60,
+        )
+        app.state.sync_flights = SingleFlight()
+        app.state.search_index = SearchIndex()
+        await app.state.search_index.setup()
+
+        write_queue: WriteQueue | None = None
+        if settings.write_queue_enabled:
+            write_queue = WriteQueue(
+                max_batch=settings.write_queue_max_batch,
+                max_delay=settings.write_queue_max_delay_ms / 1000,
+            )
+            write_queue.start()
+        app.state.write_queue = write_queue
 
+        poller: SubscriptionPoller | None = None
+        if settings.poller_enabled:
+            poller = SubscriptionPoller(
+                settings,
+                AnnouncementService(
+                    settings,
+                    swayam_service,
+                    flights=app.state.sync_flights,
+                    notification_service=NotificationService(write_queue),
+                    search_index=app.state.search_index,
+                    write_queue=write_queue,
+                ),
+            )
+            poller.start()
+        app.state.poller = poller
+
+        delivery: DeliveryWorker | None = None
+        if settings.delivery_enabled:
+            delivery = DeliveryWorker(settings, build_senders(settings))
+            delivery.start()
+        app.state.delivery = delivery
+
+        if settings.metrics_enabled:
+            cache = app.state.search_cache
+            CACHE_EVENTS.set_function(lambda: cache.hits, cache="search", event="hit")
+            CACHE_EVENTS.set_function(
+                lambda: cache.misses, cache="search", event="miss"
+            )
+            CACHE_EVENTS.set_function(
+                lambda: cache.evictions, cache="search", event="eviction"
+            )
+            if write_queue is not None:
+                QUEUE_DEPTH.set_function(lambda: write_queue.depth, queue="write")
+            if poller is not None:
+                QUEUE_DEPTH.set_function(lambda: poller.in_flight, queue="poll")
+            if delivery is not None:
+                QUEUE_DEPTH.set_function(lambda: delivery.pending, queue="delivery")
+
+        try:
+            yield
+        finally:
+            if delivery is not None:
+                await delivery.stop()
+            if poller is not None:
+                await poller.stop()
+            if write_queue is not None:
+                await write_queue.stop()
+            await swayam_service.close()
+
+    app = FastAPI(title=settings.app_name, debug=settings.debug, lifespan=lifespan)
+
+    if request_timing:
+        app.add_middleware(RequestTimingMiddleware, settings=settings)
+    if settings.metrics_enabled:
+        app.add_middleware(MetricsMiddleware)
     app.add_middleware(
         CORSMiddleware,
         allow_origins=settings.cors_origins,
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Next-Cursor", "X-Data-Age", "ETag"],
     )
 
+    @app.exception_handler(InvalidCursor)
+    async def invalid_cursor(request: Request, exc: InvalidCursor) -> JSONResponse:
+        return JSONResponse(status_code=400, content={"detail": "Invalid cursor"})
+
+    if settings.metrics_enabled:
+
+        @app.get("/metrics", include_in_schema=False)
+        async def metrics() -> PlainTextResponse:
+            return PlainTextResponse(REGISTRY.render(), media_type=CONTENT_TYPE)
+
     app.include_router(users.router)
     app.include_router(auth.router)
     app.include_router(search.router)
@@ -34,11 +153,7 @@ def create_app() -> FastAPI:
     app.include_router(subscriptions.router)
     app.include_router(notifications.router)
 
-    register_database(
-        app,
-        settings.database_url,
-        generate_schemas=settings.debug,
-    )
+    register_database(app, settings)
     return app
 
 
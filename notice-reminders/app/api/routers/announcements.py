@@ -1,8 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime
+
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    HTTPException,
+    Request,
+    Response,
+)
 
 from app.core.auth import require_auth
+from app.core.dependencies import (
+    get_announcement_service,
+    get_course_service,
+    get_page_request,
+)
+from app.core.http_cache import make_etag, not_modified
+from app.core.pagination import NEXT_CURSOR_HEADER, PageRequest
+from app.core.responses import rows_response
 from app.models.user import User
-from app.core.dependencies import get_announcement_service, get_course_service
 from app.schemas.announcement import AnnouncementResponse
 from app.services.announcement_service import AnnouncementService
 from app.services.course_service import CourseService
@@ -17,9 +33,15 @@ router = APIRouter(
 async def list_announcements(
     course_code: str,
     current_user: User,
+    request: Request,
+    response: Response,
+    background_tasks: BackgroundTasks,
+    refresh: bool = False,
+    since: datetime | None = None,
+    page: PageRequest = Depends(get_page_request),
     course_service: CourseService = Depends(get_course_service),
     announcement_service: AnnouncementService = Depends(get_announcement_service),
-) -> list[AnnouncementResponse]:
+) -> Response:
     course = await course_service.get_by_code(course_code)
 
     if not course:
@@ -28,5 +50,29 @@ async def list_announcements(
             detail="Course not found",
         )
 
-    announcements = await announcement_service.fetch_and_cache(course)
-    return [AnnouncementResponse.model_validate(item) for item in announcements]
+    age = announcement_service.data_age_seconds(course)
+    # Only the first page may trigger a refresh; later pages must be read from
+    # the same stored rows the cursor was taken from.
+    if page.cursor is None and (refresh or age is None):
+        await announcement_service.fetch_and_cache(course)
+        age = 0.0
+    elif age is not None and announcement_service.is_stale(course):
+        background_tasks.add_task(announcement_service.refresh_in_background, course)
+
+    response.headers["X-Data-Age"] = str(int(age or 0))
+    version = await announcement_service.version_for_course(course, since=since)
+    cached = not_modified(
+        request,
+        response,
+        make_etag(course.id, since, version, page),
+        background=background_tasks,
+    )
+    if cached is not None:
+        return cached
+
+    announcements = await announcement_service.page_for_course(
+        course, page, list(AnnouncementResponse.model_fields), since=since
+    )
+    if announcements.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = announcements.next_cursor
+    return rows_response(announcements.items, response)
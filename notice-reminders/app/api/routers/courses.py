@@ -1,6 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 
-from app.core.dependencies import get_course_service
+from app.core.config import Settings
+from app.core.dependencies import get_course_service, get_page_request, get_settings
+from app.core.http_cache import make_etag, not_modified
+from app.core.pagination import NEXT_CURSOR_HEADER, PageRequest
+from app.core.responses import rows_response
 from app.schemas.course import CourseResponse
 from app.services.course_service import CourseService
 
@@ -9,17 +13,45 @@ router = APIRouter(prefix="/courses", tags=["courses"])
 
 @router.get("", response_model=list[CourseResponse])
 async def list_courses(
+    request: Request,
+    response: Response,
+    nc_code: str | None = None,
+    institute: str | None = None,
+    ids: list[int] | None = Query(None, alias="id"),
+    page: PageRequest = Depends(get_page_request),
     service: CourseService = Depends(get_course_service),
-) -> list[CourseResponse]:
-    courses = await service.list_courses()
-    return [CourseResponse.model_validate(course) for course in courses]
+    settings: Settings = Depends(get_settings),
+) -> Response:
+    version = await service.list_version(nc_code=nc_code, institute=institute, ids=ids)
+    cached = not_modified(
+        request,
+        response,
+        make_etag(version, page),
+        f"public, max-age={settings.course_cache_max_age_seconds}",
+    )
+    if cached is not None:
+        return cached
+
+    courses = await service.list_courses(
+        page,
+        list(CourseResponse.model_fields),
+        nc_code=nc_code,
+        institute=institute,
+        ids=ids,
+    )
+    if courses.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = courses.next_cursor
+    return rows_response(courses.items, response)
 
 
 @router.get("/{course_code}", response_model=CourseResponse)
 async def get_course(
     course_code: str,
+    request: Request,
+    response: Response,
     service: CourseService = Depends(get_course_service),
-) -> CourseResponse:
+    settings: Settings = Depends(get_settings),
+) -> CourseResponse | Response:
     course = await service.get_by_code(course_code)
 
     if not course:
@@ -28,4 +60,12 @@ async def get_course(
             detail="Course not found",
         )
 
+    cached = not_modified(
+        request,
+        response,
+        make_etag(course.id, course.updated_at),
+        f"public, max-age={settings.course_cache_max_age_seconds}",
+    )
+    if cached is not None:
+        return cached
     return CourseResponse.model_validate(course)
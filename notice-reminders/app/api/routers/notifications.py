@@ -1,7 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 
 from app.core.auth import require_auth
-from app.core.dependencies import get_notification_service
+from app.core.dependencies import get_notification_service, get_page_request
+from app.core.http_cache import make_etag, not_modified
+from app.core.pagination import NEXT_CURSOR_HEADER, PageRequest
+from app.core.responses import rows_response
 from app.models.notification import Notification
 from app.models.user import User
 from app.schemas.notification import NotificationResponse
@@ -14,10 +17,23 @@ router = APIRouter(prefix="/notifications", tags=["notifications"])
 @require_auth
 async def list_notifications(
     current_user: User,
+    request: Request,
+    response: Response,
+    is_read: bool | None = None,
+    page: PageRequest = Depends(get_page_request),
     service: NotificationService = Depends(get_notification_service),
-) -> list[NotificationResponse]:
-    notifications = await service.list_for_user(current_user.id)
-    return [NotificationResponse.model_validate(item) for item in notifications]
+) -> Response:
+    version = await service.version_for_user(current_user.id, is_read)
+    cached = not_modified(request, response, make_etag(current_user.id, version, page))
+    if cached is not None:
+        return cached
+
+    notifications = await service.list_for_user(
+        current_user.id, page, list(NotificationResponse.model_fields), is_read
+    )
+    if notifications.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = notifications.next_cursor
+    return rows_response(notifications.items, response)
 
 
 @router.get("/users/{user_id}", response_model=list[NotificationResponse])
@@ -25,15 +41,28 @@ async def list_notifications(
 async def list_notifications_for_user(
     user_id: int,
     current_user: User,
+    request: Request,
+    response: Response,
+    is_read: bool | None = None,
+    page: PageRequest = Depends(get_page_request),
     service: NotificationService = Depends(get_notification_service),
-) -> list[NotificationResponse]:
+) -> Response:
     if current_user.id != user_id:
         raise HTTPException(
             status_code=403,
             detail="Access denied",
         )
-    notifications = await service.list_for_user(user_id)
-    return [NotificationResponse.model_validate(item) for item in notifications]
+
+    version = await service.version_for_user(user_id, is_read)
+    cached = not_modified(request, response, make_etag(user_id, version, page))
+    if cached is not None:
+        return cached
+    notifications = await service.list_for_user(
+        user_id, page, list(NotificationResponse.model_fields), is_read
+    )
+    if notifications.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = notifications.next_cursor
+    return rows_response(notifications.items, response)
 
 
 @router.patch("/{notification_id}/read", response_model=NotificationResponse)
@@ -50,8 +79,7 @@ async def mark_read(
             detail="Notification not found",
         )
 
-    notification_user = await notification.user
-    if notification_user.id != current_user.id:
+    if notification.user_id != current_user.id:
         raise HTTPException(
             status_code=403,
             detail="Access denied",
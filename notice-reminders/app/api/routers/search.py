@@ -1,8 +1,12 @@
-from fastapi import APIRouter, Depends
+from typing import Literal
 
-from app.core.dependencies import get_course_service
+from fastapi import APIRouter, Depends, Query
+
+from app.core.dependencies import get_course_service, get_search_index
 from app.schemas.course import CourseResponse
+from app.schemas.search import SearchHitResponse
 from app.services.course_service import CourseService
+from app.services.search_index import SearchIndex
 
 router = APIRouter(prefix="/search", tags=["search"])
 
@@ -14,3 +18,19 @@ async def search_courses(
 ) -> list[CourseResponse]:
     courses = await service.search_and_cache(q)
     return [CourseResponse.model_validate(course) for course in courses]
+
+
+@router.get("/cached", response_model=list[SearchHitResponse])
+async def search_cached(
+    q: str,
+    kind: Literal["course", "announcement"] | None = None,
+    course: str | None = None,
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    index: SearchIndex = Depends(get_search_index),
+) -> list[SearchHitResponse]:
+    """Search stored courses and announcements without contacting upstream."""
+    hits = await index.search(
+        q, kind=kind, course_code=course, limit=limit, offset=offset
+    )
+    return [SearchHitResponse.model_validate(hit) for hit in hits]
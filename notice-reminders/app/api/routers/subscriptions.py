@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 
 from app.core.auth import require_auth
 from app.core.dependencies import (
     get_course_service,
+    get_page_request,
     get_subscription_service,
 )
+from app.core.pagination import NEXT_CURSOR_HEADER, PageRequest
 from app.models.user import User
 from app.schemas.subscription import SubscriptionCreate, SubscriptionResponse
 from app.services.course_service import CourseService
@@ -38,10 +40,15 @@ async def create_subscription(
 @require_auth
 async def list_subscriptions(
     current_user: User,
+    response: Response,
+    is_active: bool | None = None,
+    page: PageRequest = Depends(get_page_request),
     service: SubscriptionService = Depends(get_subscription_service),
 ) -> list[SubscriptionResponse]:
-    subscriptions = await service.list_for_user(current_user)
-    return [SubscriptionResponse.model_validate(item) for item in subscriptions]
+    subscriptions = await service.list_for_user(current_user, page, is_active)
+    if subscriptions.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = subscriptions.next_cursor
+    return [SubscriptionResponse.model_validate(item) for item in subscriptions.items]
 
 
 @router.delete("/{subscription_id}", status_code=status.HTTP_204_NO_CONTENT)
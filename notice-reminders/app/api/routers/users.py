@@ -120,7 +120,9 @@ async def add_channel(
             detail="User not found",
         )
 
-    channel = await service.create(user, payload.channel, payload.address)
+    channel = await service.create(
+        user, payload.channel, payload.address, payload.digest
+    )
     return NotificationChannelResponse.model_validate(channel)
 
 
@@ -8,8 +8,12 @@ from app.scrapers import SwayamScraper
 
 async def cli_main():
     """Run the interactive CLI."""
-    client = SwayamScraper()
+    async with SwayamScraper() as client:
+        await _run(client)
 
+
+async def _run(client: SwayamScraper) -> None:
+    """Prompt for queries until the user quits."""
     print("Welcome to MOOC Course Search & Announcement Fetcher")
     print("----------------------------------------------------")
 
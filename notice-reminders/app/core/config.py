@@ -5,11 +5,56 @@ class Settings(BaseSettings):
     app_name: str = "MOOC Notice Reminders API"
     debug: bool = False
     database_url: str = "sqlite://./data/db/db.sqlite3"
+    database_profile: str = "auto"
+    sqlite_journal_mode: str = "WAL"
+    sqlite_synchronous: str = "NORMAL"
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_mmap_size: int = 268435456
+    # Negative values are in KiB, as in PRAGMA cache_size.
+    sqlite_cache_size: int = -65536
+    postgres_pool_min_size: int = 1
+    postgres_pool_max_size: int = 10
+    # Set to 0 behind a transaction-pooling proxy such as PgBouncer.
+    postgres_statement_cache_size: int = 100
+    write_queue_enabled: bool = False
+    write_queue_max_batch: int = 64
+    write_queue_max_delay_ms: float = 5.0
 
     swayam_base_url: str = "https://swayam.gov.in"
     nptel_base_url: str = "https://onlinecourses.nptel.ac.in"
 
+    http_timeout_seconds: float = 20.0
+    http_connect_timeout_seconds: float = 10.0
+    http_max_connections: int = 20
+    http_max_keepalive_connections: int = 10
+    http_keepalive_expiry_seconds: float = 30.0
+    http2_enabled: bool = True
+
+    scraper_max_concurrency: int = 8
+    nptel_rate_limit_per_second: float = 5.0
+    nptel_rate_limit_burst: float = 10.0
+    swayam2_rate_limit_per_second: float = 2.0
+    swayam2_rate_limit_burst: float = 5.0
+    validator_store: str = "database"
+    host_store: str = "database"
+    html_parser: str = "auto"
+    parse_mode: str = "inline"
+    parse_workers: int = 2
+    parse_offload_min_bytes: int = 65536
+
     cache_ttl_minutes: int = 60
+    page_size_default: int = 50
+    page_size_max: int = 200
+    course_cache_max_age_seconds: int = 300
+    search_cache_max_entries: int = 512
+
+    poller_enabled: bool = False
+    poller_concurrency: int = 4
+    poller_min_interval_minutes: float = 5
+    poller_initial_interval_minutes: float = 30
+    poller_max_interval_minutes: float = 360
+    poller_resync_minutes: float = 5
+    poller_jitter_ratio: float = 0.1
 
     telegram_bot_token: str | None = None
     smtp_host: str | None = None
@@ -17,6 +62,27 @@ class Settings(BaseSettings):
     smtp_user: str | None = None
     smtp_password: str | None = None
     smtp_from: str | None = None
+    smtp_timeout_seconds: float = 30.0
+    smtp_rate_limit_per_second: float = 5.0
+    smtp_rate_limit_burst: float = 10.0
+    telegram_api_base_url: str = "https://api.telegram.org"
+    telegram_rate_limit_per_second: float = 25.0
+    telegram_rate_limit_burst: float = 30.0
+
+    delivery_enabled: bool = False
+    delivery_batch_size: int = 100
+    delivery_poll_interval_seconds: float = 10.0
+    delivery_max_attempts: int = 5
+    delivery_retry_base_seconds: float = 30.0
+    delivery_retry_max_seconds: float = 3600.0
+    delivery_claim_seconds: float = 600.0
+
+    metrics_enabled: bool = True
+    request_timing_token: str | None = None
+    profile_sample_rate: float = 0.0
+    profile_slow_ms: float = 500.0
+    profile_dir: str = "profiles"
+
     cors_origins: list[str] = ["http://localhost:3000"]
 
     jwt_secret: str
@@ -1,12 +1,71 @@
 from pathlib import Path
 from typing import Any
+from urllib.parse import parse_qs, urlparse
 
+from tortoise import Tortoise
+from tortoise.backends.base.config_generator import expand_db_url
 from tortoise.contrib.fastapi import register_tortoise
 
+from app.core.config import Settings
+from app.core.migrations import run_migrations
 
-def get_tortoise_config(database_url: str) -> dict[str, Any]:
+_PROFILE_ENGINES = {
+    "sqlite": {"tortoise.backends.sqlite"},
+    "postgres": {"tortoise.backends.asyncpg", "tortoise.backends.psycopg"},
+}
+
+
+def database_connection(settings: Settings) -> dict[str, Any]:
+    """Tortoise connection for ``database_url``, tuned by ``database_profile``.
+
+    ``auto`` picks the profile matching the URL's scheme and ``none`` leaves
+    the backend defaults alone. The SQLite profile applies its options as
+    PRAGMAs on connect and starts transactions with ``BEGIN IMMEDIATE``; the
+    PostgreSQL profile sizes the connection pool. Parameters given in the URL
+    itself win over the profile.
+    """
+    connection = expand_db_url(settings.database_url)
+    engine = connection["engine"]
+    profile = settings.database_profile
+    if profile == "auto":
+        profile = next(
+            (name for name, engines in _PROFILE_ENGINES.items() if engine in engines),
+            "none",
+        )
+    if profile == "none":
+        return connection
+    if profile not in _PROFILE_ENGINES:
+        raise ValueError(f"Unknown database profile: {profile}")
+    if engine not in _PROFILE_ENGINES[profile]:
+        raise ValueError(f"Database profile {profile} does not apply to {engine}")
+
+    if profile == "sqlite":
+        connection["engine"] = "app.core.sqlite"
+        options: dict[str, Any] = {
+            "journal_mode": settings.sqlite_journal_mode,
+            "synchronous": settings.sqlite_synchronous,
+            "busy_timeout": settings.sqlite_busy_timeout_ms,
+            "mmap_size": settings.sqlite_mmap_size,
+            "cache_size": settings.sqlite_cache_size,
+        }
+    else:
+        options = {
+            "minsize": settings.postgres_pool_min_size,
+            "maxsize": settings.postgres_pool_max_size,
+        }
+        if engine == "tortoise.backends.asyncpg":
+            options["statement_cache_size"] = settings.postgres_statement_cache_size
+
+    explicit = parse_qs(urlparse(settings.database_url).query)
+    for key, value in options.items():
+        if key not in explicit:
+            connection["credentials"][key] = value
+    return connection
+
+
+def get_tortoise_config(connection: str | dict[str, Any]) -> dict[str, Any]:
     return {
-        "connections": {"default": database_url},
+        "connections": {"default": connection},
         "apps": {
             "models": {
                 "models": [
@@ -18,6 +77,7 @@ def get_tortoise_config(database_url: str) -> dict[str, Any]:
                     "app.models.notification_channel",
                     "app.models.otp",
                     "app.models.refresh_token",
+                    "app.models.page_validator",
                 ],
                 "default_connection": "default",
             }
@@ -36,18 +96,39 @@ def _get_sqlite_path(database_url: str) -> Path | None:
     return Path(path_part)
 
 
-def register_database(app, database_url: str, generate_schemas: bool) -> None:
-    config = get_tortoise_config(database_url)
+def _prepare_sqlite(database_url: str) -> None:
     sqlite_path = _get_sqlite_path(database_url)
-    should_generate = generate_schemas
 
     if sqlite_path is not None and not sqlite_path.exists():
         sqlite_path.parent.mkdir(parents=True, exist_ok=True)
-        should_generate = True
+
+
+def register_database(app, settings: Settings) -> None:
+    """Connect Tortoise for the app's lifetime.
+
+    Schemas are not generated here: the lifespan calls ``run_migrations``,
+    which adds new columns to existing tables before creating missing tables
+    and indexes. Generating first would index columns that do not exist yet.
+    """
+    config = get_tortoise_config(database_connection(settings))
+    _prepare_sqlite(settings.database_url)
 
     register_tortoise(
         app,
         config=config,
-        generate_schemas=should_generate,
+        generate_schemas=False,
         add_exception_handlers=True,
     )
+
+
+async def init_database(settings: Settings) -> None:
+    """Initialise Tortoise outside of FastAPI, e.g. for background workers."""
+    config = get_tortoise_config(database_connection(settings))
+    _prepare_sqlite(settings.database_url)
+
+    await Tortoise.init(config=config)
+    await run_migrations()
+
+
+async def close_database() -> None:
+    await Tortoise.close_connections()
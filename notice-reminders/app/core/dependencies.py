@@ -1,14 +1,19 @@
 from functools import lru_cache
 
-from fastapi import Depends
+from fastapi import Depends, Query, Request
 
+from app.core.cache import TTLCache
 from app.core.config import Settings
+from app.core.pagination import PageRequest
+from app.core.singleflight import SingleFlight
+from app.core.write_queue import WriteQueue
 from app.services.announcement_service import AnnouncementService
 from app.services.auth_service import AuthService
 from app.services.course_service import CourseService
 from app.services.notification_channel_service import NotificationChannelService
 from app.services.notification_service import NotificationService
 from app.services.otp_email_service import OtpEmailService
+from app.services.search_index import SearchIndex
 from app.services.subscription_service import SubscriptionService
 from app.services.swayam_service import SwayamService
 from app.services.user_service import UserService
@@ -19,29 +24,74 @@ def get_settings() -> Settings:
     return Settings()
 
 
-def get_swayam_service(
+def get_page_request(
+    limit: int | None = Query(None, ge=1),
+    cursor: str | None = None,
     settings: Settings = Depends(get_settings),
-) -> SwayamService:
-    return SwayamService(settings)
+) -> PageRequest:
+    limit = min(limit or settings.page_size_default, settings.page_size_max)
+    return PageRequest(limit=limit, cursor=cursor)
+
+
+def get_swayam_service(request: Request) -> SwayamService:
+    return request.app.state.swayam_service
+
+
+def get_search_cache(request: Request) -> TTLCache[str, tuple[str, ...]]:
+    return request.app.state.search_cache
+
+
+def get_sync_flights(request: Request) -> SingleFlight:
+    return request.app.state.sync_flights
+
+
+def get_search_index(request: Request) -> SearchIndex:
+    return request.app.state.search_index
+
+
+def get_write_queue(request: Request) -> WriteQueue | None:
+    return request.app.state.write_queue
 
 
 def get_course_service(
     settings: Settings = Depends(get_settings),
     client: SwayamService = Depends(get_swayam_service),
+    search_cache: TTLCache[str, tuple[str, ...]] = Depends(get_search_cache),
+    flights: SingleFlight = Depends(get_sync_flights),
+    search_index: SearchIndex = Depends(get_search_index),
+    write_queue: WriteQueue | None = Depends(get_write_queue),
 ) -> CourseService:
     return CourseService(
         settings=settings,
         swayam_service=client,
+        search_cache=search_cache,
+        flights=flights,
+        search_index=search_index,
+        write_queue=write_queue,
     )
 
 
+def get_notification_service(
+    write_queue: WriteQueue | None = Depends(get_write_queue),
+) -> NotificationService:
+    return NotificationService(write_queue)
+
+
 def get_announcement_service(
     settings: Settings = Depends(get_settings),
     client: SwayamService = Depends(get_swayam_service),
+    flights: SingleFlight = Depends(get_sync_flights),
+    notification_service: NotificationService = Depends(get_notification_service),
+    search_index: SearchIndex = Depends(get_search_index),
+    write_queue: WriteQueue | None = Depends(get_write_queue),
 ) -> AnnouncementService:
     return AnnouncementService(
         settings=settings,
         swayam_service=client,
+        flights=flights,
+        notification_service=notification_service,
+        search_index=search_index,
+        write_queue=write_queue,
     )
 
 
@@ -53,10 +103,6 @@ def get_subscription_service() -> SubscriptionService:
     return SubscriptionService()
 
 
-def get_notification_service() -> NotificationService:
-    return NotificationService()
-
-
 def get_notification_channel_service() -> NotificationChannelService:
     return NotificationChannelService()
 
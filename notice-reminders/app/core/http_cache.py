@@ -0,0 +1,52 @@
+"""Conditional GET support for list and detail endpoints.
+
+ETags are derived from a cheap fingerprint of the data (for example a row
+count plus the latest timestamp) rather than from the serialized body, so a
+client whose copy is current gets a 304 before any rows are loaded.
+"""
+
+import hashlib
+
+from fastapi import BackgroundTasks, Request, Response
+
+# Authenticated responses may be stored by the browser but must be
+# revalidated with the ETag on every use.
+PRIVATE = "private, no-cache"
+
+
+def make_etag(*parts: object) -> str:
+    digest = hashlib.sha256(repr(parts).encode()).hexdigest()[:32]
+    return f'W/"{digest}"'
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so a W/ prefix is ignored.
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+def not_modified(
+    request: Request,
+    response: Response,
+    etag: str,
+    cache_control: str = PRIVATE,
+    background: BackgroundTasks | None = None,
+) -> Response | None:
+    """Tag ``response`` with ``etag``; return a 304 when the client has it.
+
+    The 304 carries every header already set on ``response``. Pass the
+    route's ``background`` tasks so they still run when the body is skipped.
+    """
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is None or not _matches(if_none_match, etag):
+        return None
+    return Response(
+        status_code=304, headers=dict(response.headers), background=background
+    )
@@ -0,0 +1,291 @@
+"""In-process metrics rendered in the Prometheus text exposition format.
+
+Metrics live in a module-level registry and are served at ``/metrics``, so
+they can be read with curl or scraped by Prometheus without running any
+collector. Values are per process: the API and a standalone poller each keep
+their own.
+"""
+
+import math
+import time
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import contextmanager
+from typing import TypeVar, final
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+LabelValues = tuple[str, ...]
+
+# Media type of the Prometheus text exposition format.
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = (f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + ",".join(pairs) + "}"
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._functions: dict[LabelValues, Callable[[], float]] = {}
+
+    def _key(self, labels: dict[str, str]) -> LabelValues:
+        if labels.keys() != set(self.labelnames):
+            raise ValueError(
+                f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}"
+            )
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def set_function(self, function: Callable[[], float], **labels: str) -> None:
+        """Read the value from ``function`` whenever the metric is rendered."""
+        self._functions[self._key(labels)] = function
+
+    def samples(self) -> Iterator[tuple[str, LabelValues, float]]:
+        for key, function in self._functions.items():
+            yield self.name, key, function()
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        names = self.labelnames
+        for name, key, value in self.samples():
+            label_names = names if len(key) == len(names) else (*names, "le")
+            lines.append(
+                f"{name}{_format_labels(label_names, key)} {_format_value(value)}"
+            )
+        return lines
+
+
+@final
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def total(self) -> float:
+        """The sum over every label set."""
+        return sum(self._values.values())
+
+    def samples(self) -> Iterator[tuple[str, LabelValues, float]]:
+        for key, value in self._values.items():
+            yield self.name, key, value
+        yield from super().samples()
+
+
+@final
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[LabelValues, float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        self._values[self._key(labels)] = value
+
+    def samples(self) -> Iterator[tuple[str, LabelValues, float]]:
+        for key, value in self._values.items():
+            yield self.name, key, value
+        yield from super().samples()
+
+
+@final
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = (*sorted(buckets), math.inf)
+        # Per label set: a count per bucket (not cumulative), then the sum.
+        self._values: dict[LabelValues, tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        counts, total = self._values.setdefault(key, ([0] * len(self.buckets), [0.0]))
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[index] += 1
+                break
+        total[0] += value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observe how long the ``with`` block took, in seconds."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def samples(self) -> Iterator[tuple[str, LabelValues, float]]:
+        for key, (counts, total) in self._values.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                yield f"{self.name}_bucket", (*key, _format_value(bound)), cumulative
+            yield f"{self.name}_sum", key, total[0]
+            yield f"{self.name}_count", key, cumulative
+
+
+M = TypeVar("M", bound=_Metric)
+
+
+@final
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: M) -> M:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+@final
+class MetricsMiddleware:
+    """Records ``HTTP_REQUEST_SECONDS`` for every HTTP request.
+
+    Requests are labelled with the matched route's path template, so
+    ``/courses/{code}`` is one series however many courses exist.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            HTTP_REQUEST_SECONDS.observe(
+                time.perf_counter() - started,
+                method=scope["method"],
+                route=getattr(route, "path", "unmatched"),
+                status=str(status),
+            )
+
+
+REGISTRY = Registry()
+
+HTTP_REQUEST_SECONDS = REGISTRY.register(
+    Histogram(
+        "http_request_duration_seconds",
+        "API request latency by route template.",
+        ("method", "route", "status"),
+    )
+)
+SCRAPER_REQUESTS = REGISTRY.register(
+    Counter(
+        "scraper_requests_total",
+        "Upstream HTTP requests by host and response status.",
+        ("host", "status"),
+    )
+)
+SCRAPER_FETCH_SECONDS = REGISTRY.register(
+    Histogram(
+        "scraper_fetch_duration_seconds",
+        "Upstream HTTP request latency, including rate-limit waits.",
+        ("host",),
+    )
+)
+SCRAPER_PARSE_SECONDS = REGISTRY.register(
+    Histogram(
+        "scraper_parse_duration_seconds",
+        "HTML parse time by page kind, including waits for a parse worker.",
+        ("page",),
+    )
+)
+SCRAPER_MIRROR_FALLBACKS = REGISTRY.register(
+    Counter(
+        "scraper_mirror_fallbacks_total",
+        "Announcement fetches retried on another mirror after a 404, a server "
+        "error or a connection failure.",
+    )
+)
+CACHE_EVENTS = REGISTRY.register(
+    Counter(
+        "cache_events_total",
+        "In-process cache lookups and evictions.",
+        ("cache", "event"),
+    )
+)
+ROWS_WRITTEN = REGISTRY.register(
+    Counter(
+        "rows_written_total",
+        "Rows inserted or updated by upstream syncs.",
+        ("model", "action"),
+    )
+)
+DB_QUERIES = REGISTRY.register(
+    Counter(
+        "db_queries_total",
+        "Database statements executed, by type.",
+        ("statement",),
+    )
+)
+QUEUE_DEPTH = REGISTRY.register(
+    Gauge(
+        "background_queue_depth",
+        "Work waiting in background workers.",
+        ("queue",),
+    )
+)
@@ -0,0 +1,220 @@
+"""Idempotent schema upgrades for databases created by older versions.
+
+``generate_schemas`` only creates missing tables and indexes, so columns added
+to existing models are applied here. Each step is keyed on the column it adds:
+when the column is already present (a fresh database, or one that was upgraded
+before) the step is skipped, which makes running every step at startup cheap.
+
+A change that adds a column to an existing model adds its step here too;
+``tests/test_migrations.py`` upgrades a first-release database and fails on
+any model column it is missing.
+"""
+
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+from tortoise import Tortoise
+from tortoise.backends.base.client import BaseDBAsyncClient
+
+from app.models.announcement import content_hash, identity_hash
+from app.scrapers.parsers import parse_published_at
+
+Backfill = Callable[[BaseDBAsyncClient], Awaitable[None]]
+
+_TYPES = {
+    "sqlite": {"timestamp": "TIMESTAMP"},
+    "postgres": {"timestamp": "TIMESTAMPTZ"},
+}
+
+
+@dataclass(frozen=True)
+class AddColumn:
+    table: str
+    column: str
+    # ``{timestamp}`` is replaced with the dialect's datetime type.
+    definition: str
+    backfill: Backfill | None = None
+
+
+async def _columns(connection: BaseDBAsyncClient, table: str) -> set[str]:
+    if connection.capabilities.dialect == "sqlite":
+        rows = await connection.execute_query_dict(f'PRAGMA table_info("{table}")')
+    else:
+        rows = await connection.execute_query_dict(
+            "SELECT column_name AS name FROM information_schema.columns "
+            "WHERE table_name = $1",
+            [table],
+        )
+    return {row["name"] for row in rows}
+
+
+async def _dedupe_notifications(connection: BaseDBAsyncClient) -> None:
+    await connection.execute_script(
+        'DELETE FROM "notifications" WHERE "id" NOT IN ('
+        'SELECT MIN("id") FROM "notifications" '
+        'GROUP BY "user_id", "announcement_id", "channel_id")'
+    )
+    await connection.execute_script(
+        'CREATE UNIQUE INDEX IF NOT EXISTS "uid_notifications_user_announcement" '
+        'ON "notifications" ("user_id", "announcement_id", "channel_id")'
+    )
+
+
+async def _backfill_announcement_hashes(connection: BaseDBAsyncClient) -> None:
+    rows = await connection.execute_query_dict(
+        'SELECT "id", "course_id", "title", "date", "content" '
+        'FROM "announcements" ORDER BY "id"'
+    )
+
+    kept: dict[tuple[int, str], int] = {}
+    duplicates: dict[int, int] = {}
+    hashes: list[list[object]] = []
+    for row in rows:
+        identity = identity_hash(row["title"], row["date"])
+        key = (row["course_id"], identity)
+        if key in kept:
+            duplicates[row["id"]] = kept[key]
+            continue
+        kept[key] = row["id"]
+        hashes.append([identity, content_hash(row["content"]), row["id"]])
+
+    for duplicate, keep in duplicates.items():
+        # Point notifications at the surviving row unless the user already
+        # has the same notification for it; those copies are dropped.
+        await connection.execute_query(
+            _sql(
+                connection,
+                'UPDATE "notifications" SET "announcement_id" = ? '
+                'WHERE "announcement_id" = ? AND NOT EXISTS ('
+                'SELECT 1 FROM "notifications" AS "other" '
+                'WHERE "other"."announcement_id" = ? '
+                'AND "other"."user_id" = "notifications"."user_id" '
+                'AND COALESCE("other"."channel_id", 0) '
+                '= COALESCE("notifications"."channel_id", 0))',
+            ),
+            [keep, duplicate, keep],
+        )
+        await connection.execute_query(
+            _sql(connection, 'DELETE FROM "notifications" WHERE "announcement_id" = ?'),
+            [duplicate],
+        )
+        await connection.execute_query(
+            _sql(connection, 'DELETE FROM "announcements" WHERE "id" = ?'),
+            [duplicate],
+        )
+
+    if hashes:
+        await connection.execute_many(
+            _sql(
+                connection,
+                'UPDATE "announcements" SET "identity_hash" = ?, '
+                '"content_hash" = ? WHERE "id" = ?',
+            ),
+            hashes,
+        )
+    await connection.execute_script(
+        'CREATE UNIQUE INDEX IF NOT EXISTS "uid_announcements_course_identity" '
+        'ON "announcements" ("course_id", "identity_hash")'
+    )
+
+
+async def _backfill_published_at(connection: BaseDBAsyncClient) -> None:
+    # Only the date text was stored, so script timestamps are not available;
+    # rows whose text does not parse keep a NULL published_at.
+    rows = await connection.execute_query_dict(
+        'SELECT "id", "date" FROM "announcements"'
+    )
+    values = []
+    for row in rows:
+        published_at = parse_published_at(row["date"])
+        if published_at is not None:
+            values.append([published_at, row["id"]])
+
+    if values:
+        await connection.execute_many(
+            _sql(
+                connection,
+                'UPDATE "announcements" SET "published_at" = ? WHERE "id" = ?',
+            ),
+            values,
+        )
+
+
+async def _backfill_updated_at(connection: BaseDBAsyncClient) -> None:
+    await connection.execute_script(
+        'UPDATE "announcements" SET "updated_at" = "fetched_at"'
+    )
+
+
+def _sql(connection: BaseDBAsyncClient, sql: str) -> str:
+    """Rewrite ``?`` placeholders into the numbered form asyncpg expects."""
+    if connection.capabilities.dialect == "sqlite":
+        return sql
+    parts = sql.split("?")
+    return parts[0] + "".join(
+        f"${index}{part}" for index, part in enumerate(parts[1:], start=1)
+    )
+
+
+STEPS: list[AddColumn] = [
+    AddColumn("courses", "announcement_host", "VARCHAR(255)"),
+    AddColumn("courses", "announcements_refreshed_at", "{timestamp}"),
+    # Notifications that predate delivery tracking were already handled, so
+    # they start out as sent rather than being delivered a second time.
+    AddColumn(
+        "notifications",
+        "status",
+        "VARCHAR(20) NOT NULL DEFAULT 'sent'",
+        _dedupe_notifications,
+    ),
+    AddColumn("notifications", "attempts", "INT NOT NULL DEFAULT 0"),
+    AddColumn("notifications", "next_attempt_at", "{timestamp}"),
+    AddColumn("notifications", "delivered_at", "{timestamp}"),
+    AddColumn("notifications", "last_error", "TEXT"),
+    AddColumn(
+        "notification_channels",
+        "digest",
+        "VARCHAR(20) NOT NULL DEFAULT 'immediate'",
+    ),
+    AddColumn("announcements", "content_hash", "VARCHAR(64) NOT NULL DEFAULT ''"),
+    AddColumn(
+        "announcements",
+        "identity_hash",
+        "VARCHAR(64) NOT NULL DEFAULT ''",
+        _backfill_announcement_hashes,
+    ),
+    AddColumn("announcements", "published_at", "{timestamp}", _backfill_published_at),
+    AddColumn("announcements", "updated_at", "{timestamp}", _backfill_updated_at),
+]
+
+
+async def run_migrations(connection_name: str = "default") -> None:
+    """Bring the database up to date with the current models.
+
+    Also creates a new database from scratch: steps for tables that do not
+    exist yet are skipped and ``generate_schemas`` creates them at the end.
+    """
+    connection = Tortoise.get_connection(connection_name)
+    types = _TYPES.get(connection.capabilities.dialect, _TYPES["postgres"])
+
+    columns: dict[str, set[str]] = {}
+    for step in STEPS:
+        if step.table not in columns:
+            columns[step.table] = await _columns(connection, step.table)
+        existing = columns[step.table]
+        # No columns means the table does not exist yet; generate_schemas
+        # creates it with every column in place.
+        if not existing or step.column in existing:
+            continue
+
+        definition = step.definition.format(**types)
+        await connection.execute_script(
+            f'ALTER TABLE "{step.table}" ADD COLUMN "{step.column}" {definition}'
+        )
+        existing.add(step.column)
+        if step.backfill is not None:
+            await step.backfill(connection)
+
+    # Creates tables added since the database was first generated, plus any
+    # missing non-unique indexes.
+    await Tortoise.generate_schemas(safe=True)
@@ -0,0 +1,151 @@
+"""Keyset pagination with opaque cursors.
+
+A page is ordered by one field plus the primary key as a tie-breaker. The
+cursor encodes the last row's values for both, so the next page starts with
+an indexed range condition instead of an OFFSET that rescans skipped rows.
+
+Rows whose ordering field is NULL come last in either direction. Databases
+disagree on where NULLs sort by default, so nullable fields are ordered by an
+explicit NULL flag first.
+"""
+
+import base64
+import binascii
+import json
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Generic, TypeVar
+
+from tortoise.expressions import Q, RawSQL
+from tortoise.functions import Function
+from tortoise.models import Model
+from tortoise.queryset import QuerySet
+
+M = TypeVar("M", bound=Model)
+T = TypeVar("T")
+
+# Response header carrying the cursor for the next page, absent on the last one.
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Annotation ordering rows with a NULL ordering field after the rest.
+_NULLS_LAST = "_page_nulls_last"
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class PageRequest:
+    limit: int
+    cursor: str | None = None
+
+
+@dataclass
+class Page(Generic[T]):
+    items: list[T]
+    next_cursor: str | None = None
+
+
+def encode_cursor(values: list[Any]) -> str:
+    payload = [
+        value.isoformat() if isinstance(value, datetime) else value for value in values
+    ]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> list[Any]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise InvalidCursor(cursor) from exc
+    if not isinstance(values, list):
+        raise InvalidCursor(cursor)
+    return values
+
+
+def _after(name: str, value: Any, pk: Any, descending: bool, nullable: bool) -> Q:
+    op = "lt" if descending else "gt"
+    if value is None:
+        return Q(**{f"{name}__isnull": True, f"id__{op}": pk})
+
+    after = Q(**{f"{name}__{op}": value}) | Q(**{name: value, f"id__{op}": pk})
+    if nullable:
+        after |= Q(**{f"{name}__isnull": True})
+    return after
+
+
+def _keyset(query: QuerySet[M], ordering: str, page: PageRequest) -> QuerySet[M]:
+    descending = ordering.startswith("-")
+    name = ordering.lstrip("-")
+
+    if page.cursor is not None:
+        values = decode_cursor(page.cursor)
+        if len(values) != 2:
+            raise InvalidCursor(page.cursor)
+        value, pk = values
+        model_field = query.model._meta.fields_map[name]
+        if value is not None:
+            try:
+                value = model_field.to_python_value(value)
+            except (TypeError, ValueError) as exc:
+                raise InvalidCursor(page.cursor) from exc
+        query = query.filter(_after(name, value, pk, descending, model_field.null))
+
+    direction = "-" if descending else ""
+    orderings = [ordering, f"{direction}id"]
+    meta = query.model._meta
+    if meta.fields_map[name].null:
+        # Literal SQL, since bound CASE results have no type on PostgreSQL.
+        column = f'"{meta.db_table}"."{meta.fields_db_projection[name]}"'
+        query = query.annotate(
+            **{_NULLS_LAST: RawSQL(f"CASE WHEN {column} IS NULL THEN 1 ELSE 0 END")}
+        )
+        orderings.insert(0, _NULLS_LAST)
+    return query.order_by(*orderings).limit(page.limit + 1)
+
+
+async def paginate(query: QuerySet[M], ordering: str, page: PageRequest) -> Page[M]:
+    """Fetch one page of ``query`` ordered by ``ordering`` (``-`` for descending).
+
+    Raises ``InvalidCursor`` when ``page.cursor`` was not produced by this
+    ordering.
+    """
+    rows = await _keyset(query, ordering, page)
+    if len(rows) <= page.limit:
+        return Page(rows)
+
+    last = rows[page.limit - 1]
+    name = ordering.lstrip("-")
+    return Page(rows[: page.limit], encode_cursor([getattr(last, name), last.pk]))
+
+
+async def paginate_values(
+    query: QuerySet[M], ordering: str, page: PageRequest, fields: Sequence[str]
+) -> Page[dict[str, Any]]:
+    """Like ``paginate``, but fetch only ``fields`` as plain dicts.
+
+    Skips building model instances, for responses that are serialized as-is.
+    ``fields`` must include ``id`` and the ordering field.
+    """
+    rows = await _keyset(query, ordering, page).values(*fields)
+    if len(rows) <= page.limit:
+        return Page(rows)
+
+    last = rows[page.limit - 1]
+    return Page(
+        rows[: page.limit], encode_cursor([last[ordering.lstrip("-")], last["id"]])
+    )
+
+
+async def fingerprint(query: QuerySet[M], **aggregates: Function) -> tuple[Any, ...]:
+    """Aggregate ``query`` into a single row that changes whenever it does.
+
+    Used to version a whole listing (e.g. row count plus latest timestamp)
+    without loading any of its rows.
+    """
+    rows = await query.annotate(**aggregates).values_list(*aggregates)
+    return tuple(rows[0])
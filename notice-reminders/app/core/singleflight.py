@@ -0,0 +1,39 @@
+"""Request coalescing for concurrent identical work."""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, TypeVar, final
+
+T = TypeVar("T")
+
+
+@final
+class SingleFlight:
+    """Runs at most one call per key at a time and shares its result.
+
+    Callers that arrive while a call for the same key is in flight await that
+    call instead of starting their own. A caller being cancelled does not
+    cancel the shared call for everyone else.
+    """
+
+    def __init__(self) -> None:
+        self._tasks: dict[Hashable, asyncio.Future[Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._tasks[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Future[Any]) -> None:
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        # Mark the exception as retrieved even if every caller went away.
+        if not task.cancelled():
+            task.exception()
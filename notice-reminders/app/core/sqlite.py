@@ -0,0 +1,35 @@
+"""Tortoise SQLite backend whose transactions take the write lock up front.
+
+SQLite's default deferred transactions start as readers and upgrade to a
+writer on their first write. When another process has written in between,
+the upgrade fails immediately with "database is locked" regardless of the
+busy timeout. ``BEGIN IMMEDIATE`` acquires the write lock when the
+transaction starts, where the busy timeout does apply.
+"""
+
+import sqlite3
+
+from tortoise.backends.base.client import TransactionContext
+from tortoise.backends.sqlite.client import SqliteClient as BaseSqliteClient
+from tortoise.backends.sqlite.client import (
+    SqliteTransactionContext,
+    SqliteTransactionWrapper,
+)
+from tortoise.exceptions import TransactionManagementError
+
+
+class ImmediateTransactionWrapper(SqliteTransactionWrapper):
+    async def begin(self) -> None:
+        try:
+            await self._connection.commit()
+            await self._connection.execute("BEGIN IMMEDIATE")
+        except sqlite3.OperationalError as exc:
+            raise TransactionManagementError(exc)
+
+
+class SqliteClient(BaseSqliteClient):
+    def _in_transaction(self) -> TransactionContext:
+        return SqliteTransactionContext(ImmediateTransactionWrapper(self), self._lock)
+
+
+client_class = SqliteClient
@@ -0,0 +1,222 @@
+"""Per-request timing breakdowns and sampled profiles of slow requests.
+
+An instrumented request gets a ``Server-Timing`` header with the number and
+total duration of the database queries and upstream HTTP requests it made,
+so N+1 patterns show up in the browser's network panel. Every request is
+instrumented in debug mode. Otherwise only requests whose
+``X-Debug-Timing`` header matches ``REQUEST_TIMING_TOKEN`` are.
+
+Separately, ``PROFILE_SAMPLE_RATE`` of requests run under cProfile, and the
+profile is written to ``PROFILE_DIR`` when the request took longer than
+``PROFILE_SLOW_MS``. cProfile sees the whole event loop thread, so the
+profile also contains whatever other requests ran at the same time, and
+only one request is profiled at a time.
+"""
+
+import asyncio
+import cProfile
+import functools
+import hmac
+import logging
+import random
+import re
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, final
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from tortoise.backends.base.client import BaseDBAsyncClient
+
+from app.core.config import Settings
+from app.core.metrics import DB_QUERIES
+
+logger = logging.getLogger(__name__)
+
+TIMING_HEADER = "X-Debug-Timing"
+
+_QUERY_METHODS = (
+    "execute_insert",
+    "execute_many",
+    "execute_query",
+    "execute_query_dict",
+    "execute_script",
+)
+
+
+@final
+class RequestTimings:
+    def __init__(self) -> None:
+        # Per name: how many times it ran and the total seconds spent.
+        self.entries: dict[str, tuple[int, float]] = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        count, total = self.entries.get(name, (0, 0.0))
+        self.entries[name] = (count + 1, total + seconds)
+
+    def server_timing(self, total: float) -> str:
+        metrics = [
+            f'{name};dur={seconds * 1000:.1f};desc="{count}x"'
+            for name, (count, seconds) in self.entries.items()
+        ]
+        metrics.append(f"total;dur={total * 1000:.1f}")
+        return ", ".join(metrics)
+
+
+_current: ContextVar[RequestTimings | None] = ContextVar(
+    "request_timings", default=None
+)
+# Set while a query method runs, so a backend method that calls another one
+# is only counted once.
+_in_query: ContextVar[bool] = ContextVar("in_query", default=False)
+
+_STATEMENTS = frozenset(("SELECT", "INSERT", "UPDATE", "DELETE"))
+
+
+@contextmanager
+def timed(name: str) -> Iterator[None]:
+    """Add the ``with`` block's duration to the current request, if timed."""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, time.perf_counter() - started)
+
+
+def _statement(query: object) -> str:
+    words = str(query).split(None, 1)
+    statement = words[0].upper() if words else ""
+    return statement if statement in _STATEMENTS else "OTHER"
+
+
+def _instrumented_query(
+    method: Callable[..., Awaitable[Any]],
+) -> Callable[..., Any]:
+    @functools.wraps(method)
+    async def wrapper(self: Any, query: Any, *args: Any, **kwargs: Any) -> Any:
+        if _in_query.get():
+            return await method(self, query, *args, **kwargs)
+
+        DB_QUERIES.inc(statement=_statement(query))
+        token = _in_query.set(True)
+        try:
+            with timed("db"):
+                return await method(self, query, *args, **kwargs)
+        finally:
+            _in_query.reset(token)
+
+    wrapper.__instrumented__ = True  # type: ignore[attr-defined]
+    return wrapper
+
+
+def _client_classes(cls: type[BaseDBAsyncClient]) -> Iterator[type]:
+    yield cls
+    for subclass in cls.__subclasses__():
+        yield from _client_classes(subclass)
+
+
+def instrument_queries() -> None:
+    """Count database queries by statement type and time them for requests.
+
+    This is the only database hook: each query increments ``DB_QUERIES`` and,
+    inside a timed request, adds to its ``db`` Server-Timing entry. Wraps
+    the query methods of every loaded Tortoise client class, including
+    transaction wrappers, so call it after the database is initialised.
+    """
+    for cls in set(_client_classes(BaseDBAsyncClient)):
+        for name in _QUERY_METHODS:
+            method = cls.__dict__.get(name)
+            if method is not None and not hasattr(method, "__instrumented__"):
+                setattr(cls, name, _instrumented_query(method))
+
+
+def _profile_path(directory: Path, scope: Scope, seconds: float) -> Path:
+    route = getattr(scope.get("route"), "path", scope["path"])
+    slug = re.sub(r"[^A-Za-z0-9]+", "-", route).strip("-") or "root"
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+    name = f"{stamp}-{scope['method']}-{slug}-{seconds * 1000:.0f}ms.prof"
+    return directory / name
+
+
+@final
+class RequestTimingMiddleware:
+    def __init__(self, app: ASGIApp, settings: Settings) -> None:
+        self.app = app
+        self.always = settings.debug
+        self.token = settings.request_timing_token
+        self.sample_rate = settings.profile_sample_rate
+        self.slow_seconds = settings.profile_slow_ms / 1000
+        self.profile_dir = Path(settings.profile_dir)
+        self._header = TIMING_HEADER.lower().encode()
+        self._profiling = False
+
+    def _wants_timing(self, scope: Scope) -> bool:
+        if self.always:
+            return True
+        if not self.token:
+            return False
+        for name, value in scope["headers"]:
+            if name == self._header:
+                return hmac.compare_digest(value, self.token.encode())
+        return False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings() if self._wants_timing(scope) else None
+        profiler: cProfile.Profile | None = None
+        if (
+            not self._profiling
+            and self.sample_rate > 0
+            and random.random() < self.sample_rate
+        ):
+            self._profiling = True
+            profiler = cProfile.Profile()
+
+        started = time.perf_counter()
+
+        async def send_with_timing(message: Message) -> None:
+            if timings is not None and message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Server-Timing",
+                    timings.server_timing(time.perf_counter() - started),
+                )
+            await send(message)
+
+        token = _current.set(timings)
+        if profiler is not None:
+            profiler.enable()
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            if profiler is not None:
+                profiler.disable()
+                self._profiling = False
+                elapsed = time.perf_counter() - started
+                if elapsed >= self.slow_seconds:
+                    await self._dump(profiler, scope, elapsed)
+
+    async def _dump(
+        self, profiler: cProfile.Profile, scope: Scope, seconds: float
+    ) -> None:
+        path = _profile_path(self.profile_dir, scope, seconds)
+        try:
+            self.profile_dir.mkdir(parents=True, exist_ok=True)
+            await asyncio.to_thread(profiler.dump_stats, path)
+        except OSError:
+            logger.exception("Failed to write profile %s", path)
+        else:
+            logger.info("Wrote profile of a %.0fms request to %s", seconds * 1000, path)
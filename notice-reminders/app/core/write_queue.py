@@ -0,0 +1,143 @@
+"""Group commit for SQLite: one writer task runs queued writes in batches.
+
+SQLite has a single write lock, and every implicit transaction pays for its
+own commit. With the queue running, services submit their write operations
+instead of running them. The writer takes the first waiting operation,
+collects more for up to ``max_delay`` seconds or until ``max_batch`` are
+queued, and runs them all in one transaction. Each operation gets its own
+savepoint, so a failing one only rolls back its own writes and its caller
+receives the exception; the others still commit. Callers are resumed once
+the transaction has committed.
+
+Operations run on the writer task, inside its transaction, so ORM calls in
+them use that transaction without passing a connection around.
+"""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any, Generic, TypeVar, final
+
+from tortoise.transactions import in_transaction
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+Operation = Callable[[], Awaitable[T]]
+
+
+@dataclass
+class _Write(Generic[T]):
+    operation: Operation[T]
+    future: asyncio.Future[T]
+
+
+@final
+class WriteQueue:
+    def __init__(
+        self,
+        max_batch: int = 64,
+        max_delay: float = 0.005,
+        connection_name: str = "default",
+    ) -> None:
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.connection_name = connection_name
+        self._queue: asyncio.Queue[_Write[Any] | None] = asyncio.Queue()
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def depth(self) -> int:
+        """Writes submitted but not yet picked up by the writer."""
+        return self._queue.qsize()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        """Commit everything already submitted, then stop the writer."""
+        task, self._task = self._task, None
+        if task is not None:
+            self._queue.put_nowait(None)
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def submit(self, operation: Operation[T]) -> T:
+        """Run ``operation`` in the next group transaction and return its result.
+
+        Runs it directly when the writer is not started, or when called from
+        an operation that is already running on the writer.
+        """
+        if self._task is None or asyncio.current_task() is self._task:
+            return await operation()
+
+        future: asyncio.Future[T] = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait(_Write(operation, future))
+        return await future
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            first = await self._queue.get()
+            if first is None:
+                return
+
+            batch = [first]
+            stopping = False
+            deadline = loop.time() + self.max_delay
+            while len(batch) < self.max_batch:
+                try:
+                    write = await asyncio.wait_for(
+                        self._queue.get(), max(deadline - loop.time(), 0)
+                    )
+                except TimeoutError:
+                    break
+                if write is None:
+                    stopping = True
+                    break
+                batch.append(write)
+
+            await self._commit(batch)
+            if stopping:
+                return
+
+    async def _commit(self, batch: list[_Write[Any]]) -> None:
+        outcomes: list[tuple[_Write[Any], Any, BaseException | None]] = []
+        try:
+            async with in_transaction(self.connection_name):
+                for write in batch:
+                    try:
+                        # Nested, so this opens a savepoint in the batch.
+                        async with in_transaction(self.connection_name):
+                            result = await write.operation()
+                    # Whatever the operation raises belongs to its caller and
+                    # is re-raised from its future below; only that write's
+                    # savepoint is rolled back.
+                    except Exception as exc:  # noqa: BLE001
+                        outcomes.append((write, None, exc))
+                    else:
+                        outcomes.append((write, result, None))
+        except Exception as exc:
+            logger.exception("Group commit of %d writes failed", len(batch))
+            for write in batch:
+                if not write.future.done():
+                    write.future.set_exception(exc)
+            return
+
+        for write, result, error in outcomes:
+            if write.future.done():
+                # The caller stopped waiting; the write is committed anyway.
+                continue
+            if error is not None:
+                write.future.set_exception(error)
+            else:
+                write.future.set_result(result)
+
+
+async def submit_write(queue: WriteQueue | None, operation: Operation[T]) -> T:
+    """Run ``operation`` through ``queue``, or directly when there is none."""
+    if queue is None:
+        return await operation()
+    return await queue.submit(operation)
@@ -0,0 +1,353 @@
+"""Background delivery of pending notifications to email and Telegram.
+
+The worker drains due ``pending`` notifications in batches, hands each
+channel's share to its sender in one call, and records the outcome of the
+whole batch with a single bulk update. Failed messages are retried with
+exponential backoff until ``delivery_max_attempts`` is reached.
+
+Before sending, a batch is claimed by moving it to ``sending`` in its own
+transaction, so workers running side by side never send the same
+notification twice. The claim lasts ``delivery_claim_seconds``; if the worker
+dies before recording the outcome, the notifications become due again then.
+
+Channels in hourly or daily digest mode accumulate notifications instead;
+once the window they were created in has closed, everything pending for the
+channel goes out as one aggregated message.
+"""
+
+import asyncio
+import logging
+import random
+from collections.abc import Mapping, Sequence
+from datetime import datetime, timedelta, timezone
+from typing import final
+
+from tortoise.expressions import F, Q
+from tortoise.queryset import QuerySet
+from tortoise.transactions import in_transaction
+
+from app.core.config import Settings
+from app.core.ratelimit import TokenBucket
+from app.delivery.senders import (
+    DeliveryError,
+    OutgoingMessage,
+    Sender,
+    SmtpSender,
+    TelegramSender,
+)
+from app.models.notification import Notification, NotificationStatus
+from app.models.notification_channel import DigestMode, NotificationChannel
+
+logger = logging.getLogger(__name__)
+
+
+def build_senders(settings: Settings) -> dict[str, Sender]:
+    """Create a sender for every channel that has credentials configured."""
+    senders: dict[str, Sender] = {}
+    if settings.smtp_host and settings.smtp_from:
+        senders[SmtpSender.channel] = SmtpSender(
+            settings.smtp_host,
+            settings.smtp_port,
+            settings.smtp_from,
+            username=settings.smtp_user,
+            password=settings.smtp_password,
+            timeout=settings.smtp_timeout_seconds,
+            rate_limit=TokenBucket(
+                settings.smtp_rate_limit_per_second, settings.smtp_rate_limit_burst
+            ),
+        )
+    if settings.telegram_bot_token:
+        senders[TelegramSender.channel] = TelegramSender(
+            settings.telegram_bot_token,
+            api_base_url=settings.telegram_api_base_url,
+            timeout=settings.http_timeout_seconds,
+            max_connections=settings.http_max_connections,
+            rate_limit=TokenBucket(
+                settings.telegram_rate_limit_per_second,
+                settings.telegram_rate_limit_burst,
+            ),
+        )
+    return senders
+
+
+def render(notification: Notification) -> OutgoingMessage:
+    announcement = notification.announcement
+    course = announcement.course
+    return OutgoingMessage(
+        address=notification.channel.address,
+        subject=f"{course.title}: {announcement.title}",
+        body=f"{announcement.date}\n\n{announcement.content}\n\n{course.url}",
+    )
+
+
+def render_digest(
+    channel: NotificationChannel, notifications: Sequence[Notification]
+) -> OutgoingMessage:
+    if len(notifications) == 1:
+        return render(notifications[0])
+
+    sections = []
+    for notification in notifications:
+        announcement = notification.announcement
+        course = announcement.course
+        sections.append(
+            f"{course.title}: {announcement.title}\n{announcement.date}\n\n"
+            f"{announcement.content}\n\n{course.url}"
+        )
+    return OutgoingMessage(
+        address=channel.address,
+        subject=f"{len(notifications)} new announcements",
+        body="\n\n---\n\n".join(sections),
+    )
+
+
+def digest_windows(now: datetime) -> dict[DigestMode, datetime]:
+    """Start of the current window for each digest mode."""
+    hour = now.replace(minute=0, second=0, microsecond=0)
+    return {DigestMode.HOURLY: hour, DigestMode.DAILY: hour.replace(hour=0)}
+
+
+@final
+class DeliveryWorker:
+    """Sends pending notifications through the configured channel senders."""
+
+    def __init__(self, settings: Settings, senders: Mapping[str, Sender]) -> None:
+        self.senders = dict(senders)
+        self.batch_size = settings.delivery_batch_size
+        self.poll_interval = settings.delivery_poll_interval_seconds
+        self.max_attempts = settings.delivery_max_attempts
+        self.retry_base = settings.delivery_retry_base_seconds
+        self.retry_max = settings.delivery_retry_max_seconds
+        self.claim_seconds = settings.delivery_claim_seconds
+        # Pending notifications as of the last poll, for the metrics endpoint.
+        self.pending = 0
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def run(self) -> None:
+        for sender in self.senders.values():
+            await sender.open()
+
+        try:
+            while True:
+                try:
+                    delivered = await self.deliver_due()
+                    self.pending = await Notification.filter(
+                        status=NotificationStatus.PENDING
+                    ).count()
+                except Exception:
+                    logger.exception("Notification delivery failed")
+                    delivered = 0
+                if delivered < self.batch_size:
+                    await asyncio.sleep(self.poll_interval)
+        finally:
+            for sender in self.senders.values():
+                await sender.close()
+
+    async def deliver_due(self) -> int:
+        """Attempt one batch of due notifications; returns how many were tried."""
+        if not self.senders:
+            return 0
+
+        now = datetime.now(timezone.utc)
+        return await self._deliver_immediate(now) + await self._deliver_digests(now)
+
+    def _due(self, now: datetime) -> Q:
+        # A sending notification is due again once its claim has expired.
+        return Q(
+            Q(next_attempt_at__isnull=True) | Q(next_attempt_at__lte=now),
+            status__in=[NotificationStatus.PENDING, NotificationStatus.SENDING],
+            channel__channel__in=list(self.senders),
+            channel__is_active=True,
+        )
+
+    async def _claim(
+        self, query: QuerySet[Notification], now: datetime
+    ) -> list[Notification]:
+        """Mark the notifications ``query`` selects as sending and load them.
+
+        Rows another worker has locked are skipped, and only rows this call
+        moved to sending are returned.
+        """
+        async with in_transaction():
+            # values_list() would drop the row locks.
+            locked = await query.select_for_update(
+                skip_locked=True, of=("notifications",)
+            )
+            if not locked:
+                return []
+            ids = [notification.id for notification in locked]
+            await Notification.filter(id__in=ids).update(
+                status=NotificationStatus.SENDING,
+                next_attempt_at=now + timedelta(seconds=self.claim_seconds),
+            )
+        return (
+            await Notification.filter(id__in=ids)
+            .select_related("channel", "announcement__course")
+            .order_by("id")
+        )
+
+    async def _deliver_immediate(self, now: datetime) -> int:
+        notifications = await self._claim(
+            Notification.filter(self._due(now), channel__digest=DigestMode.IMMEDIATE)
+            .order_by("id")
+            .limit(self.batch_size),
+            now,
+        )
+        if not notifications:
+            return 0
+
+        by_channel: dict[str, list[Notification]] = {}
+        for notification in notifications:
+            by_channel.setdefault(notification.channel.channel, []).append(notification)
+
+        outcomes = await asyncio.gather(
+            *(
+                self._send(self.senders[channel], batch)
+                for channel, batch in by_channel.items()
+            )
+        )
+
+        now = datetime.now(timezone.utc)
+        for batch, errors in zip(by_channel.values(), outcomes):
+            for notification, error in zip(batch, errors):
+                self._record(notification, error, now)
+
+        await Notification.bulk_update(
+            notifications,
+            fields=[
+                "status",
+                "attempts",
+                "next_attempt_at",
+                "delivered_at",
+                "last_error",
+            ],
+        )
+        return len(notifications)
+
+    async def _deliver_digests(self, now: datetime) -> int:
+        # Only notifications created before the current window started are due,
+        # so a digest never goes out while its window is still filling up.
+        closed = Q(
+            *(
+                Q(channel__digest=mode, sent_at__lt=start)
+                for mode, start in digest_windows(now).items()
+            ),
+            join_type=Q.OR,
+        )
+        channel_ids = (
+            await Notification.filter(self._due(now), closed)
+            .distinct()
+            .limit(self.batch_size)
+            .values_list("channel_id", flat=True)
+        )
+        if not channel_ids:
+            return 0
+
+        notifications = await self._claim(
+            Notification.filter(
+                self._due(now), closed, channel_id__in=list(channel_ids)
+            ),
+            now,
+        )
+        digests: dict[int, list[Notification]] = {}
+        for notification in notifications:
+            digests.setdefault(notification.channel_id, []).append(notification)
+
+        by_channel: dict[str, list[list[Notification]]] = {}
+        for digest in digests.values():
+            by_channel.setdefault(digest[0].channel.channel, []).append(digest)
+
+        outcomes = await asyncio.gather(
+            *(
+                self._send_digests(self.senders[channel], batch)
+                for channel, batch in by_channel.items()
+            )
+        )
+
+        now = datetime.now(timezone.utc)
+        sent: list[int] = []
+        for batch, errors in zip(by_channel.values(), outcomes):
+            for digest, error in zip(batch, errors):
+                ids = [notification.id for notification in digest]
+                if error is None:
+                    sent.extend(ids)
+                    continue
+
+                attempts = max(notification.attempts for notification in digest) + 1
+                retry_at = self._retry_at(attempts, now)
+                failed = retry_at is None or not error.retryable
+                await Notification.filter(id__in=ids).update(
+                    status=NotificationStatus.FAILED
+                    if failed
+                    else NotificationStatus.PENDING,
+                    attempts=attempts,
+                    next_attempt_at=None if failed else retry_at,
+                    last_error=str(error),
+                )
+
+        if sent:
+            await Notification.filter(id__in=sent).update(
+                status=NotificationStatus.SENT,
+                attempts=F("attempts") + 1,
+                delivered_at=now,
+                next_attempt_at=None,
+                last_error=None,
+            )
+        return len(notifications)
+
+    async def _send_digests(
+        self, sender: Sender, digests: Sequence[Sequence[Notification]]
+    ) -> list[DeliveryError | None]:
+        try:
+            return await sender.send_batch(
+                [render_digest(digest[0].channel, digest) for digest in digests]
+            )
+        except Exception as exc:
+            logger.exception("%s sender failed", sender.channel)
+            return [DeliveryError(str(exc) or type(exc).__name__)] * len(digests)
+
+    def _retry_at(self, attempts: int, now: datetime) -> datetime | None:
+        if attempts >= self.max_attempts:
+            return None
+        delay = min(self.retry_base * 2 ** (attempts - 1), self.retry_max)
+        delay *= random.uniform(0.9, 1.1)
+        return now + timedelta(seconds=delay)
+
+    async def _send(
+        self, sender: Sender, batch: Sequence[Notification]
+    ) -> list[DeliveryError | None]:
+        try:
+            return await sender.send_batch([render(item) for item in batch])
+        except Exception as exc:
+            logger.exception("%s sender failed", sender.channel)
+            return [DeliveryError(str(exc) or type(exc).__name__)] * len(batch)
+
+    def _record(
+        self, notification: Notification, error: DeliveryError | None, now: datetime
+    ) -> None:
+        notification.attempts += 1
+        if error is None:
+            notification.status = NotificationStatus.SENT
+            notification.delivered_at = now
+            notification.next_attempt_at = None
+            notification.last_error = None
+            return
+
+        retry_at = self._retry_at(notification.attempts, now)
+        if retry_at is None or not error.retryable:
+            notification.status = NotificationStatus.FAILED
+            notification.next_attempt_at = None
+        else:
+            notification.status = NotificationStatus.PENDING
+            notification.next_attempt_at = retry_at
+        notification.last_error = str(error)
@@ -0,0 +1,222 @@
+"""Channel senders that push rendered notifications to external services."""
+
+import asyncio
+import smtplib
+import ssl
+from collections.abc import Sequence
+from dataclasses import dataclass
+from email.message import EmailMessage
+from typing import Protocol, final
+
+import httpx
+
+from app.core.ratelimit import TokenBucket
+
+
+@dataclass(frozen=True)
+class OutgoingMessage:
+    address: str
+    subject: str
+    body: str
+
+
+class DeliveryError(Exception):
+    """A message could not be delivered.
+
+    ``retryable`` is false when sending it again cannot succeed, e.g. the
+    recipient does not exist.
+    """
+
+    def __init__(self, message: str, retryable: bool = True) -> None:
+        super().__init__(message)
+        self.retryable = retryable
+
+
+class Sender(Protocol):
+    channel: str
+
+    async def open(self) -> None: ...
+
+    async def close(self) -> None: ...
+
+    async def send_batch(
+        self, messages: Sequence[OutgoingMessage]
+    ) -> list[DeliveryError | None]:
+        """Send ``messages``, returning one result per message, ``None`` on success."""
+        ...
+
+
+@final
+class SmtpSender:
+    """Sends email over a single authenticated SMTP session per batch."""
+
+    channel = "email"
+
+    def __init__(
+        self,
+        host: str,
+        port: int | None,
+        sender: str,
+        username: str | None = None,
+        password: str | None = None,
+        timeout: float = 30.0,
+        rate_limit: TokenBucket | None = None,
+    ) -> None:
+        self.host = host
+        self.port = port or 587
+        self.sender = sender
+        self.username = username
+        self.password = password
+        self.timeout = timeout
+        self.rate_limit = rate_limit
+
+    async def open(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+    def _connect(self) -> smtplib.SMTP:
+        context = ssl.create_default_context()
+        if self.port == 465:
+            smtp: smtplib.SMTP = smtplib.SMTP_SSL(
+                self.host, self.port, timeout=self.timeout, context=context
+            )
+        else:
+            smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.port != 465:
+                smtp.ehlo()
+                if smtp.has_extn("starttls"):
+                    smtp.starttls(context=context)
+                    smtp.ehlo()
+                elif self.username or self.password:
+                    # Never send credentials over a plaintext connection.
+                    raise smtplib.SMTPNotSupportedError(
+                        f"{self.host} does not offer STARTTLS; "
+                        "refusing to log in without TLS"
+                    )
+            if self.username and self.password:
+                smtp.login(self.username, self.password)
+        except BaseException:
+            smtp.close()
+            raise
+        return smtp
+
+    def _build(self, message: OutgoingMessage) -> EmailMessage:
+        email = EmailMessage()
+        email["From"] = self.sender
+        email["To"] = message.address
+        email["Subject"] = message.subject
+        email.set_content(message.body)
+        return email
+
+    async def send_batch(
+        self, messages: Sequence[OutgoingMessage]
+    ) -> list[DeliveryError | None]:
+        results: list[DeliveryError | None] = []
+        smtp: smtplib.SMTP | None = None
+        try:
+            for index, message in enumerate(messages):
+                if smtp is None:
+                    try:
+                        smtp = await asyncio.to_thread(self._connect)
+                    except (smtplib.SMTPException, OSError) as exc:
+                        # The server is unreachable or refused the login, so
+                        # the rest of the batch would fail the same way.
+                        error = DeliveryError(str(exc) or type(exc).__name__)
+                        results.extend([error] * (len(messages) - index))
+                        break
+                if self.rate_limit is not None:
+                    await self.rate_limit.acquire()
+                try:
+                    await asyncio.to_thread(smtp.send_message, self._build(message))
+                except smtplib.SMTPRecipientsRefused as exc:
+                    results.append(DeliveryError(str(exc), retryable=False))
+                except (smtplib.SMTPException, OSError) as exc:
+                    if isinstance(exc, smtplib.SMTPServerDisconnected):
+                        smtp = None
+                    results.append(DeliveryError(str(exc)))
+                else:
+                    results.append(None)
+        finally:
+            if smtp is not None:
+                await asyncio.to_thread(_quit, smtp)
+        return results
+
+
+def _quit(smtp: smtplib.SMTP) -> None:
+    try:
+        smtp.quit()
+    except (smtplib.SMTPException, OSError):
+        smtp.close()
+
+
+@final
+class TelegramSender:
+    """Sends Telegram messages through a pooled Bot API client."""
+
+    channel = "telegram"
+    MAX_MESSAGE_LENGTH = 4096
+
+    def __init__(
+        self,
+        token: str,
+        api_base_url: str = "https://api.telegram.org",
+        timeout: float = 20.0,
+        max_connections: int = 20,
+        rate_limit: TokenBucket | None = None,
+    ) -> None:
+        self.url = f"{api_base_url.rstrip('/')}/bot{token}/sendMessage"
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.rate_limit = rate_limit
+        self._client: httpx.AsyncClient | None = None
+
+    async def open(self) -> None:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+            )
+
+    async def close(self) -> None:
+        client, self._client = self._client, None
+        if client is not None:
+            await client.aclose()
+
+    async def send_batch(
+        self, messages: Sequence[OutgoingMessage]
+    ) -> list[DeliveryError | None]:
+        await self.open()
+        return list(await asyncio.gather(*map(self._send, messages)))
+
+    async def _send(self, message: OutgoingMessage) -> DeliveryError | None:
+        assert self._client is not None
+        if self.rate_limit is not None:
+            await self.rate_limit.acquire()
+
+        text = f"{message.subject}\n\n{message.body}"[: self.MAX_MESSAGE_LENGTH]
+        try:
+            response = await self._client.post(
+                self.url, json={"chat_id": message.address, "text": text}
+            )
+        except httpx.HTTPError as exc:
+            return DeliveryError(str(exc) or type(exc).__name__)
+
+        if response.is_success:
+            return None
+
+        try:
+            description = response.json().get("description", response.text)
+        except ValueError:
+            description = response.text
+        # 429 and server errors are transient; anything else (unknown chat,
+        # bot blocked by the user) will fail the same way next time.
+        retryable = response.status_code == 429 or response.status_code >= 500
+        return DeliveryError(
+            f"{response.status_code}: {description}", retryable=retryable
+        )
@@ -1,6 +1,8 @@
 """Domain models (Dataclasses) for notice-reminders."""
 
 from dataclasses import dataclass
+from datetime import datetime
+
 from typing_extensions import override
 
 
@@ -27,6 +29,7 @@ class Announcement:
     title: str
     date: str
     content: str
+    published_at: datetime | None = None  # ``date`` parsed to an aware UTC datetime
 
     @override
     def __str__(self) -> str:
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import hashlib
 from typing import final
 
 from tortoise import fields
@@ -8,6 +9,15 @@ from tortoise.models import Model
 from app.models.course import Course
 
 
+def identity_hash(title: str, date: str) -> str:
+    """Stable key identifying an announcement within its course."""
+    return hashlib.sha256(f"{title}\x1f{date}".encode()).hexdigest()
+
+
+def content_hash(content: str) -> str:
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
 @final
 class Announcement(Model):
     id = fields.IntField(pk=True)
@@ -17,8 +27,14 @@ class Announcement(Model):
     title = fields.CharField(max_length=500)
     date = fields.CharField(max_length=50)
     content = fields.TextField()
+    identity_hash = fields.CharField(max_length=64)
+    content_hash = fields.CharField(max_length=64)
+    published_at = fields.DatetimeField(null=True, index=True)
     fetched_at = fields.DatetimeField(auto_now_add=True)
+    updated_at = fields.DatetimeField(auto_now=True)
 
     @final
     class Meta:
         table = "announcements"
+        unique_together = (("course", "identity_hash"),)
+        indexes = (("course", "published_at", "id"),)
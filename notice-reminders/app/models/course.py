@@ -13,9 +13,12 @@ class Course(Model):
     instructor = fields.CharField(max_length=255)
     institute = fields.CharField(max_length=255)
     nc_code = fields.CharField(max_length=50)
+    announcement_host = fields.CharField(max_length=255, null=True)
+    announcements_refreshed_at = fields.DatetimeField(null=True)
     created_at = fields.DatetimeField(auto_now_add=True)
     updated_at = fields.DatetimeField(auto_now=True)
 
     @final
     class Meta:
         table = "courses"
+        indexes = (("title", "id"),)
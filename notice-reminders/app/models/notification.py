@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from enum import StrEnum
 from typing import final
 
 from tortoise import fields
@@ -11,6 +12,15 @@ from app.models.subscription import Subscription
 from app.models.user import User
 
 
+class NotificationStatus(StrEnum):
+    PENDING = "pending"
+    # Claimed by a delivery worker; ``next_attempt_at`` is when the claim
+    # expires and the notification becomes due again.
+    SENDING = "sending"
+    SENT = "sent"
+    FAILED = "failed"
+
+
 @final
 class Notification(Model):
     id = fields.IntField(pk=True)
@@ -30,7 +40,16 @@ class Notification(Model):
     )
     sent_at = fields.DatetimeField(auto_now_add=True)
     is_read = fields.BooleanField(default=False)
+    status = fields.CharEnumField(
+        NotificationStatus, max_length=20, default=NotificationStatus.PENDING
+    )
+    attempts = fields.IntField(default=0)
+    next_attempt_at = fields.DatetimeField(null=True)
+    delivered_at = fields.DatetimeField(null=True)
+    last_error = fields.TextField(null=True)
 
     @final
     class Meta:
         table = "notifications"
+        unique_together = (("user", "announcement", "channel"),)
+        indexes = (("status", "next_attempt_at"), ("user", "sent_at", "id"))
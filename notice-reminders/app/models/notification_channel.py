@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from enum import StrEnum
 from typing import final
 
 from tortoise import fields
@@ -8,6 +9,12 @@ from tortoise.models import Model
 from app.models.user import User
 
 
+class DigestMode(StrEnum):
+    IMMEDIATE = "immediate"
+    HOURLY = "hourly"
+    DAILY = "daily"
+
+
 @final
 class NotificationChannel(Model):
     id = fields.IntField(pk=True)
@@ -17,6 +24,9 @@ class NotificationChannel(Model):
     channel = fields.CharField(max_length=50)
     address = fields.CharField(max_length=255)
     is_active = fields.BooleanField(default=True)
+    digest = fields.CharEnumField(
+        DigestMode, max_length=20, default=DigestMode.IMMEDIATE
+    )
     created_at = fields.DatetimeField(auto_now_add=True)
 
     @final
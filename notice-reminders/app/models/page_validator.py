@@ -0,0 +1,18 @@
+from typing import final
+
+from tortoise import fields
+from tortoise.models import Model
+
+
+@final
+class PageValidator(Model):
+    id = fields.IntField(pk=True)
+    url = fields.CharField(max_length=500, unique=True, index=True)
+    etag = fields.CharField(max_length=255, null=True)
+    last_modified = fields.CharField(max_length=100, null=True)
+    body_hash = fields.CharField(max_length=64)
+    updated_at = fields.DatetimeField(auto_now=True)
+
+    @final
+    class Meta:
+        table = "page_validators"
@@ -25,3 +25,4 @@ class Subscription(Model):
     class Meta:
         table = "subscriptions"
         unique_together = (("user", "course"),)
+        indexes = (("user", "created_at", "id"),)
@@ -0,0 +1,252 @@
+"""Background poller that keeps subscribed courses' announcements fresh.
+
+Each course with at least one active subscription sits in a priority queue
+keyed on when it is next due. A course whose announcements change is polled
+more often; one that stays quiet backs off towards the maximum interval.
+Courses that fall due together are fetched as one batch through the
+scraper's bounded concurrent fetch.
+"""
+
+import asyncio
+import heapq
+import logging
+import random
+import time
+from dataclasses import dataclass, field
+from typing import final
+
+from app.core.config import Settings
+from app.core.database import close_database, init_database
+from app.core.write_queue import WriteQueue
+from app.delivery import DeliveryWorker, build_senders
+from app.models.course import Course
+from app.models.subscription import Subscription
+from app.services.announcement_service import AnnouncementService
+from app.services.notification_service import NotificationService
+from app.services.search_index import SearchIndex
+from app.services.swayam_service import SwayamService
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(order=True)
+class _Due:
+    at: float
+    course_id: int = field(compare=False)
+
+
+@final
+class SubscriptionPoller:
+    """Polls subscribed courses on adaptive, jittered per-course intervals."""
+
+    SPEED_UP = 0.5
+    BACK_OFF = 1.5
+
+    def __init__(
+        self, settings: Settings, announcement_service: AnnouncementService
+    ) -> None:
+        self.settings = settings
+        self.announcement_service = announcement_service
+        self.min_interval = settings.poller_min_interval_minutes * 60
+        self.max_interval = settings.poller_max_interval_minutes * 60
+        self.initial_interval = settings.poller_initial_interval_minutes * 60
+        self.resync_interval = settings.poller_resync_minutes * 60
+        self.jitter_ratio = settings.poller_jitter_ratio
+        self.concurrency = settings.poller_concurrency
+        self._queue: list[_Due] = []
+        self._intervals: dict[int, float] = {}
+        # The live queue entry of each course. Other entries are stale, e.g.
+        # left from before the course was removed and added again, and are
+        # skipped when popped.
+        self._scheduled: dict[int, _Due] = {}
+        self._polling: set[int] = set()
+        self._in_flight: set[asyncio.Task[None]] = set()
+        self._rescheduled = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+
+    def __len__(self) -> int:
+        return len(self._intervals)
+
+    @property
+    def in_flight(self) -> int:
+        """Courses being polled right now."""
+        return len(self._polling)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        tasks = [task, *self._in_flight] if task else list(self._in_flight)
+        for pending in tasks:
+            pending.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def run(self) -> None:
+        next_resync = 0.0
+
+        while True:
+            now = time.monotonic()
+            if now >= next_resync:
+                try:
+                    await self._load_subscribed_courses()
+                except Exception:
+                    logger.exception("Failed to load subscribed courses")
+                next_resync = now + self.resync_interval
+
+            batch = self._take_due()
+            if batch:
+                task = asyncio.create_task(self._poll(batch))
+                self._in_flight.add(task)
+                task.add_done_callback(self._in_flight.discard)
+
+            if len(self._polling) >= self.concurrency:
+                # Woken by the next finished course instead of spinning on
+                # courses that are due but have no free slot.
+                next_due = next_resync
+            else:
+                next_due = self._queue[0].at if self._queue else next_resync
+            delay = min(next_due, next_resync) - time.monotonic()
+            try:
+                await asyncio.wait_for(self._rescheduled.wait(), max(delay, 0.1))
+            except TimeoutError:
+                pass
+            self._rescheduled.clear()
+
+    async def _load_subscribed_courses(self) -> None:
+        course_ids = set(
+            await Subscription.filter(is_active=True)
+            .distinct()
+            .values_list("course_id", flat=True)
+        )
+
+        for course_id in self._intervals.keys() - course_ids:
+            del self._intervals[course_id]
+            self._scheduled.pop(course_id, None)
+
+        now = time.monotonic()
+        for course_id in course_ids - self._intervals.keys():
+            self._intervals[course_id] = self.initial_interval
+            # Spread newly seen courses out instead of polling them all at once.
+            first_due = now + random.uniform(0, self.min_interval)
+            self._push(_Due(first_due, course_id))
+
+    def _take_due(self) -> list[int]:
+        """Pop the courses that are due, as many as there are free slots."""
+        batch: list[int] = []
+        while (
+            self._queue
+            and self._queue[0].at <= time.monotonic()
+            and len(self._polling) < self.concurrency
+        ):
+            due = heapq.heappop(self._queue)
+            if self._scheduled.get(due.course_id) is not due:
+                continue
+
+            del self._scheduled[due.course_id]
+            if due.course_id in self._polling:
+                # Re-added while its previous poll is still running, which
+                # schedules it again when it finishes.
+                continue
+
+            self._polling.add(due.course_id)
+            batch.append(due.course_id)
+        return batch
+
+    async def _poll(self, course_ids: list[int]) -> None:
+        """Poll a batch of due courses; each frees its slot once rescheduled."""
+        try:
+            courses = await Course.filter(id__in=course_ids)
+            for course_id in set(course_ids) - {course.id for course in courses}:
+                self._intervals.pop(course_id, None)
+                self._done(course_id)
+
+            async for course, result in self.announcement_service.refresh_many(courses):
+                interval = self._intervals.get(course.id)
+                if interval is not None:
+                    if isinstance(result, Exception):
+                        logger.error(
+                            "Polling course %s failed", course.code, exc_info=result
+                        )
+                        interval *= self.BACK_OFF * 2
+                    else:
+                        interval *= self.SPEED_UP if result.changed else self.BACK_OFF
+                    self._schedule(course.id, interval)
+                self._done(course.id)
+        except Exception:
+            logger.exception("Polling %d courses failed", len(course_ids))
+        finally:
+            # Courses the batch never got to back off instead of dropping out
+            # of the queue.
+            for course_id in course_ids:
+                if course_id in self._polling:
+                    interval = self._intervals.get(course_id)
+                    if interval is not None:
+                        self._schedule(course_id, interval * self.BACK_OFF * 2)
+                    self._done(course_id)
+
+    def _done(self, course_id: int) -> None:
+        self._polling.discard(course_id)
+        self._rescheduled.set()
+
+    def _schedule(self, course_id: int, interval: float) -> None:
+        if course_id not in self._intervals:
+            return
+
+        interval = min(max(interval, self.min_interval), self.max_interval)
+        self._intervals[course_id] = interval
+        jitter = interval * self.jitter_ratio
+        due = time.monotonic() + interval + random.uniform(-jitter, jitter)
+        self._push(_Due(due, course_id))
+        self._rescheduled.set()
+
+    def _push(self, due: _Due) -> None:
+        self._scheduled[due.course_id] = due
+        heapq.heappush(self._queue, due)
+
+
+async def poller_main() -> None:
+    """Run the poller standalone until interrupted."""
+    settings = Settings()
+    await init_database(settings)
+
+    search_index = SearchIndex()
+    await search_index.setup()
+
+    write_queue: WriteQueue | None = None
+    if settings.write_queue_enabled:
+        write_queue = WriteQueue(
+            max_batch=settings.write_queue_max_batch,
+            max_delay=settings.write_queue_max_delay_ms / 1000,
+        )
+        write_queue.start()
+
+    swayam_service = SwayamService(settings)
+    await swayam_service.open()
+    poller = SubscriptionPoller(
+        settings,
+        AnnouncementService(
+            settings,
+            swayam_service,
+            notification_service=NotificationService(write_queue),
+            search_index=search_index,
+            write_queue=write_queue,
+        ),
+    )
+
+    delivery: DeliveryWorker | None = None
+    if settings.delivery_enabled:
+        delivery = DeliveryWorker(settings, build_senders(settings))
+        delivery.start()
+
+    try:
+        await poller.run()
+    finally:
+        if delivery is not None:
+            await delivery.stop()
+        await poller.stop()
+        if write_queue is not None:
+            await write_queue.stop()
+        await swayam_service.close()
+        await close_database()
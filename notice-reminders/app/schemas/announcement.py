@@ -9,6 +9,7 @@ class AnnouncementResponse(BaseModel):
     title: str
     date: str
     content: str
+    published_at: datetime | None
     fetched_at: datetime
 
     class Config:
@@ -2,6 +2,8 @@ from datetime import datetime
 
 from pydantic import BaseModel
 
+from app.models.notification import NotificationStatus
+
 
 class NotificationResponse(BaseModel):
     id: int
@@ -11,6 +13,8 @@ class NotificationResponse(BaseModel):
     channel_id: int | None
     sent_at: datetime
     is_read: bool
+    status: NotificationStatus
+    delivered_at: datetime | None
 
     class Config:
         from_attributes = True
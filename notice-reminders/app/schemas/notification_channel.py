@@ -2,11 +2,14 @@ from datetime import datetime
 
 from pydantic import BaseModel
 
+from app.models.notification_channel import DigestMode
+
 
 class NotificationChannelCreate(BaseModel):
     channel: str
     address: str
     is_active: bool = True
+    digest: DigestMode = DigestMode.IMMEDIATE
 
 
 class NotificationChannelResponse(BaseModel):
@@ -15,6 +18,7 @@ class NotificationChannelResponse(BaseModel):
     channel: str
     address: str
     is_active: bool
+    digest: DigestMode
     created_at: datetime
 
     class Config:
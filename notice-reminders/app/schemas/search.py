@@ -0,0 +1,15 @@
+from typing import Literal
+
+from pydantic import BaseModel
+
+
+class SearchHitResponse(BaseModel):
+    kind: Literal["course", "announcement"]
+    id: int
+    course_code: str
+    title: str
+    snippet: str
+    score: float
+
+    class Config:
+        from_attributes = True
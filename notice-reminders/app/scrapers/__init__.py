@@ -1,14 +1,58 @@
 """Swayam course scraper - shared between CLI and API."""
 
-import re
-from datetime import datetime
-from typing import final
+import asyncio
+import hashlib
+import multiprocessing
+from collections.abc import AsyncIterator, Callable, Iterable, Mapping
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from types import TracebackType
+from typing import Self, TypeVar, final
+from urllib.parse import urlsplit
 
 import httpx
-from bs4 import BeautifulSoup
-from bs4.element import NavigableString, Tag
 
+from app.core.metrics import (
+    SCRAPER_FETCH_SECONDS,
+    SCRAPER_MIRROR_FALLBACKS,
+    SCRAPER_PARSE_SECONDS,
+    SCRAPER_REQUESTS,
+)
+from app.core.ratelimit import TokenBucket
+from app.core.timing import timed
 from app.domain.models import Announcement, Course
+from app.scrapers.parsers import HtmlParser, get_parser
+from app.scrapers.state import (
+    HostStore,
+    MemoryHostStore,
+    MemoryValidatorStore,
+    PageValidators,
+    ValidatorStore,
+)
+
+T = TypeVar("T")
+
+PARSE_MODES = ("inline", "thread", "process")
+
+
+def _mirror_failed(response: httpx.Response) -> bool:
+    """Whether another mirror should be tried after ``response``."""
+    return response.status_code == 404 or response.is_server_error
+
+
+@dataclass
+class AnnouncementPage:
+    """Announcements parsed from a fetched page.
+
+    For conditional fetches, ``validators`` describe this version of the page.
+    They are only remembered once the caller passes the page to
+    ``save_validators`` after storing the announcements, so a failed store
+    does not make the next fetch skip the page as unchanged.
+    """
+
+    url: str
+    announcements: list[Announcement]
+    validators: PageValidators | None = None
 
 
 @final
@@ -17,6 +61,8 @@ class SwayamScraper:
 
     BASE_URL = "https://swayam.gov.in"
     NPTEL_BASE_URL = "https://onlinecourses.nptel.ac.in"
+    SWAYAM2_BASE_URL = "https://onlinecourses.swayam2.ac.in"
+    MIRROR_BASE_URLS = (NPTEL_BASE_URL, SWAYAM2_BASE_URL)
 
     HEADERS = {
         "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:147.0) Gecko/20100101 Firefox/147.0",
@@ -35,135 +81,268 @@ class SwayamScraper:
         "Priority": "u=0, i",
     }
 
+    def __init__(
+        self,
+        *,
+        timeout: float = 20.0,
+        connect_timeout: float = 10.0,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+        http2: bool = True,
+        max_concurrency: int = 8,
+        host_rate_limits: Mapping[str, tuple[float, float]] | None = None,
+        validator_store: ValidatorStore | None = None,
+        host_store: HostStore | None = None,
+        parser: str | HtmlParser = "auto",
+        parse_mode: str = "inline",
+        parse_workers: int = 2,
+        parse_offload_min_bytes: int = 64 * 1024,
+    ) -> None:
+        if parse_mode not in PARSE_MODES:
+            raise ValueError(f"Unknown parse mode: {parse_mode}")
+
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.http2 = http2
+        self.max_concurrency = max_concurrency
+        # Shared by every announcement fetch, so bulk polling and on-demand
+        # refreshes together stay under ``max_concurrency`` requests.
+        self._fetch_slots = asyncio.Semaphore(max_concurrency)
+        self._buckets = {
+            host: TokenBucket(rate, burst)
+            for host, (rate, burst) in (host_rate_limits or {}).items()
+        }
+        self.validator_store = validator_store or MemoryValidatorStore()
+        self.host_store = host_store or MemoryHostStore()
+        self.parser = get_parser(parser) if isinstance(parser, str) else parser
+        self.parse_mode = parse_mode
+        self.parse_workers = parse_workers
+        self.parse_offload_min_bytes = parse_offload_min_bytes
+        self._client: httpx.AsyncClient | None = None
+        self._executor: Executor | None = None
+
+    async def open(self) -> None:
+        """Open the pooled HTTP client and parse workers shared by all requests."""
+        if self._client is not None:
+            return
+
+        self._client = httpx.AsyncClient(
+            headers=self.HEADERS,
+            follow_redirects=True,
+            timeout=self.timeout,
+            limits=self.limits,
+            http2=self.http2,
+        )
+
+        if self.parse_mode == "thread":
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.parse_workers, thread_name_prefix="swayam-parse"
+            )
+        elif self.parse_mode == "process":
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.parse_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+
+    async def close(self) -> None:
+        """Close the pooled HTTP client and shut down the parse workers."""
+        if self._client is None:
+            return
+
+        client, self._client = self._client, None
+        executor, self._executor = self._executor, None
+        await client.aclose()
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    async def __aenter__(self) -> Self:
+        await self.open()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        await self.close()
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Return the open HTTP client."""
+        if self._client is None:
+            raise RuntimeError("SwayamScraper is not open; call open() first")
+        return self._client
+
+    def _bucket_for(self, url: str) -> TokenBucket | None:
+        host = urlsplit(url).hostname or ""
+        for suffix, bucket in self._buckets.items():
+            if host == suffix or host.endswith(f".{suffix}"):
+                return bucket
+        return None
+
+    async def _get(self, url: str, **kwargs) -> httpx.Response:
+        """Issue a GET, waiting on the rate limit of the target host if any."""
+        host = urlsplit(url).hostname or ""
+        status = "error"
+        with SCRAPER_FETCH_SECONDS.time(host=host), timed("http"):
+            try:
+                bucket = self._bucket_for(url)
+                if bucket is not None:
+                    await bucket.acquire()
+                response = await self.client.get(url, **kwargs)
+                status = str(response.status_code)
+                return response
+            finally:
+                SCRAPER_REQUESTS.inc(host=host, status=status)
+
     async def search_courses(self, query: str) -> list[Course]:
         """Search for courses by query string."""
         url = f"{self.BASE_URL}/search_courses"
         params = {"searchText": query}
 
-        async with httpx.AsyncClient(
-            headers=self.HEADERS, follow_redirects=True
-        ) as client:
-            response = await client.get(url, params=params)
-            _ = response.raise_for_status()
-            return self._parse_search_results(response.text)
-
-    def _parse_search_results(self, html: str) -> list[Course]:
-        """Parse HTML search results into Course objects."""
-        soup = BeautifulSoup(html, "html.parser")
-        courses: list[Course] = []
-
-        course_links = soup.find_all("a", href=True)
-
-        for link in course_links:
-            card = link.find("div", class_="es-course-card")
-            if not card:
-                continue
+        response = await self._get(url, params=params)
+        _ = response.raise_for_status()
+        return await self._parse_search_results(response.text)
 
-            course_url = link.get("href")
-            if not isinstance(course_url, str):
-                continue
+    async def _parse(self, parse: Callable[[str], T], html: str, page: str) -> T:
+        """Run ``parse`` inline, or on the worker pool for large pages."""
+        with SCRAPER_PARSE_SECONDS.time(page=page), timed("parse"):
+            if self._executor is None or len(html) < self.parse_offload_min_bytes:
+                return parse(html)
 
-            title_elem = card.find("h4", class_="courseTitle")
-            title = title_elem.get_text(strip=True) if title_elem else "Unknown Title"
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, parse, html)
 
-            instructor_div = card.find("div", class_="courseInstructor")
-            instructor = (
-                instructor_div.get_text(strip=True)
-                if instructor_div
-                else "Unknown Instructor"
-            )
-
-            institute_div = card.find("div", class_="courseInstitute")
-            institute = (
-                institute_div.get_text(strip=True)
-                if institute_div
-                else "Unknown Institute"
-            )
-
-            nc_elem = card.find("strong", class_="text-danger")
-            nc_code = nc_elem.get_text(strip=True) if nc_elem else "Unknown NC"
-
-            code_match = re.search(r"/([^/]+)/preview", course_url)
-            code = code_match.group(1) if code_match else ""
-
-            if code:
-                courses.append(
-                    Course(
-                        title=title,
-                        url=course_url,
-                        code=code,
-                        instructor=instructor,
-                        institute=institute,
-                        nc_code=nc_code,
-                    )
-                )
-
-        return courses
+    async def _parse_search_results(self, html: str) -> list[Course]:
+        """Parse HTML search results into Course objects."""
+        return await self._parse(self.parser.parse_search_results, html, "search")
 
     async def get_announcements(self, course_code: str) -> list[Announcement]:
         """Fetch announcements for a course by its code."""
-        url = f"{self.NPTEL_BASE_URL}/{course_code}/announcements"
-
-        async with httpx.AsyncClient(
-            headers=self.HEADERS, follow_redirects=True
-        ) as client:
-            response = await client.get(url)
-
-            if response.status_code == 404:
-                url = f"https://onlinecourses.swayam2.ac.in/{course_code}/announcements"
-                response = await client.get(url)
-
-            _ = response.raise_for_status()
-            return self._parse_announcements(response.text)
-
-    def _parse_announcements(self, html: str) -> list[Announcement]:
+        page = await self._fetch_announcements(course_code, conditional=False)
+        return page.announcements if page is not None else []
+
+    async def get_announcements_if_changed(
+        self, course_code: str
+    ) -> AnnouncementPage | None:
+        """Fetch announcements, or return None if the page is unchanged.
+
+        Sends the validators saved from the previous fetch, so an upstream
+        304 or an identical body skips parsing altogether. Pass the returned
+        page to ``save_validators`` once its announcements are stored.
+        """
+        return await self._fetch_announcements(course_code, conditional=True)
+
+    async def save_validators(self, page: AnnouncementPage) -> None:
+        """Remember ``page``'s validators for the next conditional fetch."""
+        if page.validators is not None:
+            await self.validator_store.set(page.url, page.validators)
+
+    async def _fetch_announcements(
+        self, course_code: str, conditional: bool
+    ) -> AnnouncementPage | None:
+        remembered = await self.host_store.get(course_code)
+        mirrors = list(self.MIRROR_BASE_URLS)
+        if remembered in mirrors:
+            mirrors.remove(remembered)
+            mirrors.insert(0, remembered)
+
+        response: httpx.Response | None = None
+        previous: PageValidators | None = None
+        for attempt, base_url in enumerate(mirrors):
+            if attempt:
+                SCRAPER_MIRROR_FALLBACKS.inc()
+            url = f"{base_url}/{course_code}/announcements"
+            try:
+                response, previous = await self._get_page(url, conditional)
+            except httpx.TransportError:
+                if attempt == len(mirrors) - 1:
+                    raise
+                response = None
+
+            if response is not None and not _mirror_failed(response):
+                break
+            if base_url == remembered:
+                await self.host_store.invalidate(course_code)
+
+        assert response is not None
+        served = response.is_success or response.status_code == 304
+        if served and base_url != remembered:
+            await self.host_store.set(course_code, base_url)
+
+        if conditional and response.status_code == 304:
+            return None
+
+        _ = response.raise_for_status()
+        if not conditional:
+            return AnnouncementPage(url, await self._parse_announcements(response.text))
+
+        validators = PageValidators(
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+            body_hash=hashlib.sha256(response.content).hexdigest(),
+        )
+        if previous is not None and previous.body_hash == validators.body_hash:
+            # Same content as the stored version; only the headers changed.
+            await self.validator_store.set(url, validators)
+            return None
+
+        announcements = await self._parse_announcements(response.text)
+        return AnnouncementPage(url, announcements, validators)
+
+    async def _get_page(
+        self, url: str, conditional: bool
+    ) -> tuple[httpx.Response, PageValidators | None]:
+        """GET a page, sending stored validators when ``conditional`` is set."""
+        previous = await self.validator_store.get(url) if conditional else None
+        headers: dict[str, str] = {}
+        if previous is not None:
+            if previous.etag:
+                headers["If-None-Match"] = previous.etag
+            if previous.last_modified:
+                headers["If-Modified-Since"] = previous.last_modified
+
+        async with self._fetch_slots:
+            return await self._get(url, headers=headers), previous
+
+    async def get_announcements_many(
+        self, course_codes: Iterable[str], conditional: bool = False
+    ) -> AsyncIterator[tuple[str, AnnouncementPage | None | Exception]]:
+        """Fetch announcements for many courses concurrently.
+
+        Yields ``(course_code, page)`` pairs in completion order, or
+        ``(course_code, error)`` when a single course fails. With
+        ``conditional`` set, unchanged pages yield ``None``. At most
+        ``max_concurrency`` requests run at once, counted together with every
+        other announcement fetch of this scraper.
+        """
+
+        async def fetch(
+            code: str,
+        ) -> tuple[str, AnnouncementPage | None | Exception]:
+            try:
+                return code, await self._fetch_announcements(code, conditional)
+            # One course failing must not abort the rest of the batch; the
+            # error is yielded with its course code for the caller.
+            except Exception as exc:  # noqa: BLE001
+                return code, exc
+
+        tasks = [
+            asyncio.create_task(fetch(code)) for code in dict.fromkeys(course_codes)
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _parse_announcements(self, html: str) -> list[Announcement]:
         """Parse HTML announcements into Announcement objects."""
-        soup = BeautifulSoup(html, "html.parser")
-        announcements: list[Announcement] = []
-
-        titles = soup.find_all("span", class_="gcb-announcement-title")
-
-        for title_span in titles:
-            h2 = title_span.parent
-            if not h2 or not isinstance(h2, Tag):
-                continue
-
-            title_text = title_span.get_text(strip=True)
-
-            date_p = h2.find_next_sibling("p")
-            date_text = "Unknown Date"
-            if date_p:
-                parts = []
-                for element in date_p.children:
-                    if getattr(element, "name", None) == "script":
-                        continue
-                    if isinstance(element, NavigableString):
-                        parts.append(element.strip())
-                    elif hasattr(element, "get_text"):
-                        parts.append(element.get_text(strip=True))
-
-                date_text = " ".join(filter(None, parts))
-
-                if not date_text:
-                    script = date_p.find("script")
-                    if script and script.string:
-                        match = re.search(r"new Date\(([\d\.]+)\)", script.string)
-                        if match:
-                            ts = float(match.group(1))
-                            dt = datetime.fromtimestamp(ts / 1000.0)
-                            date_text = dt.strftime("%Y-%m-%d")
-
-            content_p = (
-                date_p.find_next_sibling("p", class_="gcb-announcement-content")
-                if date_p
-                else None
-            )
-            content_text = ""
-            if content_p:
-                content_text = content_p.get_text(separator="\n", strip=True)
-
-            announcements.append(
-                Announcement(title=title_text, date=date_text, content=content_text)
-            )
-
-        return announcements
+        return await self._parse(self.parser.parse_announcements, html, "announcements")
@@ -0,0 +1,392 @@
+"""HTML parser backends for Swayam search and NPTEL announcement pages.
+
+``SoupParser`` is the original BeautifulSoup implementation and works
+everywhere. ``LxmlParser`` produces the same results but jumps straight to
+the course card and announcement nodes with XPath, which is much cheaper on
+large pages. Malformed markup such as block elements nested inside ``<p>``
+builds a different tree: libxml2 closes the paragraph early like a browser
+does, while ``html.parser`` keeps the nested blocks inside it. libxml2 then
+reports the paragraph's own end tag as unexpected, and ``LxmlParser`` hands
+such pages to ``SoupParser`` so both backends always agree.
+"""
+
+import re
+from datetime import datetime, timezone
+from typing import Protocol, final
+
+from bs4 import BeautifulSoup
+from bs4.element import NavigableString, Tag
+
+from app.domain.models import Announcement, Course
+
+try:
+    from lxml import etree as lxml_etree
+    from lxml import html as lxml_html
+except ImportError:  # pragma: no cover - lxml is optional
+    lxml_etree = None
+    lxml_html = None
+
+COURSE_CODE_PATTERN = re.compile(r"/([^/]+)/preview")
+SCRIPT_DATE_PATTERN = re.compile(r"new Date\(([\d\.]+)\)")
+DATE_FORMATS = (
+    "%Y-%m-%d",
+    "%Y-%m-%d %H:%M:%S",
+    "%d %B %Y",
+    "%d %b %Y",
+    "%B %d, %Y",
+    "%b %d, %Y",
+    "%A, %d %B %Y",
+    "%d-%m-%Y",
+    "%d/%m/%Y",
+)
+
+
+def _course_code(course_url: str) -> str:
+    code_match = COURSE_CODE_PATTERN.search(course_url)
+    return code_match.group(1) if code_match else ""
+
+
+def _script_timestamp(script_text: str) -> float | None:
+    match = SCRIPT_DATE_PATTERN.search(script_text)
+    return float(match.group(1)) / 1000.0 if match else None
+
+
+def _date_from_script(script_text: str) -> str | None:
+    ts = _script_timestamp(script_text)
+    if ts is None:
+        return None
+
+    dt = datetime.fromtimestamp(ts)
+    return dt.strftime("%Y-%m-%d")
+
+
+def parse_published_at(
+    date_text: str, script_text: str | None = None
+) -> datetime | None:
+    """Best-effort UTC datetime for an announcement's date.
+
+    The ``new Date(...)`` timestamp in the date paragraph's script is exact and
+    wins when present; otherwise ``date_text`` is matched against the formats
+    NPTEL pages use. Returns ``None`` for anything unrecognised.
+    """
+    ts = _script_timestamp(script_text) if script_text else None
+    if ts is not None:
+        return datetime.fromtimestamp(ts, tz=timezone.utc)
+
+    text = " ".join(date_text.split())
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).replace(tzinfo=timezone.utc)
+        except ValueError:
+            continue
+    return None
+
+
+class HtmlParser(Protocol):
+    """Turns raw page HTML into domain objects."""
+
+    name: str
+
+    def parse_search_results(self, html: str) -> list[Course]: ...
+
+    def parse_announcements(self, html: str) -> list[Announcement]: ...
+
+
+@final
+class SoupParser:
+    """BeautifulSoup parser on the pure-Python ``html.parser`` backend."""
+
+    name = "soup"
+
+    def parse_search_results(self, html: str) -> list[Course]:
+        """Parse HTML search results into Course objects."""
+        soup = BeautifulSoup(html, "html.parser")
+        courses: list[Course] = []
+
+        course_links = soup.find_all("a", href=True)
+
+        for link in course_links:
+            card = link.find("div", class_="es-course-card")
+            if not card:
+                continue
+
+            course_url = link.get("href")
+            if not isinstance(course_url, str):
+                continue
+
+            title_elem = card.find("h4", class_="courseTitle")
+            title = title_elem.get_text(strip=True) if title_elem else "Unknown Title"
+
+            instructor_div = card.find("div", class_="courseInstructor")
+            instructor = (
+                instructor_div.get_text(strip=True)
+                if instructor_div
+                else "Unknown Instructor"
+            )
+
+            institute_div = card.find("div", class_="courseInstitute")
+            institute = (
+                institute_div.get_text(strip=True)
+                if institute_div
+                else "Unknown Institute"
+            )
+
+            nc_elem = card.find("strong", class_="text-danger")
+            nc_code = nc_elem.get_text(strip=True) if nc_elem else "Unknown NC"
+
+            code = _course_code(course_url)
+
+            if code:
+                courses.append(
+                    Course(
+                        title=title,
+                        url=course_url,
+                        code=code,
+                        instructor=instructor,
+                        institute=institute,
+                        nc_code=nc_code,
+                    )
+                )
+
+        return courses
+
+    def parse_announcements(self, html: str) -> list[Announcement]:
+        """Parse HTML announcements into Announcement objects."""
+        soup = BeautifulSoup(html, "html.parser")
+        announcements: list[Announcement] = []
+
+        titles = soup.find_all("span", class_="gcb-announcement-title")
+
+        for title_span in titles:
+            h2 = title_span.parent
+            if not h2 or not isinstance(h2, Tag):
+                continue
+
+            title_text = title_span.get_text(strip=True)
+
+            date_p = h2.find_next_sibling("p")
+            date_text = "Unknown Date"
+            script_text = None
+            if date_p:
+                parts = []
+                for element in date_p.children:
+                    if getattr(element, "name", None) == "script":
+                        continue
+                    if isinstance(element, NavigableString):
+                        parts.append(element.strip())
+                    elif hasattr(element, "get_text"):
+                        parts.append(element.get_text(strip=True))
+
+                date_text = " ".join(filter(None, parts))
+
+                script = date_p.find("script")
+                if script and script.string:
+                    script_text = script.string
+                if not date_text:
+                    date_text = (
+                        script_text and _date_from_script(script_text)
+                    ) or date_text
+
+            content_p = (
+                date_p.find_next_sibling("p", class_="gcb-announcement-content")
+                if date_p
+                else None
+            )
+            content_text = ""
+            if content_p:
+                content_text = content_p.get_text(separator="\n", strip=True)
+
+            announcements.append(
+                Announcement(
+                    title=title_text,
+                    date=date_text,
+                    content=content_text,
+                    published_at=parse_published_at(date_text, script_text),
+                )
+            )
+
+        return announcements
+
+
+def _has_class(name: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+@final
+class LxmlParser:
+    """lxml parser that selects the card and announcement nodes directly."""
+
+    name = "lxml"
+
+    _CARDS = f"//a[@href]//div[{_has_class('es-course-card')}]"
+    _TITLE = f".//h4[{_has_class('courseTitle')}]"
+    _INSTRUCTOR = f".//div[{_has_class('courseInstructor')}]"
+    _INSTITUTE = f".//div[{_has_class('courseInstitute')}]"
+    _NC_CODE = f".//strong[{_has_class('text-danger')}]"
+    _ANNOUNCEMENT_TITLES = f"//span[{_has_class('gcb-announcement-title')}]"
+    # BeautifulSoup's get_text() skips script, style and template contents.
+    _TEXT = ".//text()[not(parent::script or parent::style or parent::template)]"
+
+    def __init__(self) -> None:
+        if lxml_html is None:
+            raise ImportError("lxml is required for the lxml parser backend")
+        self._fallback = SoupParser()
+
+    def _document(self, html: str):
+        """Parse ``html``, or return ``None`` if libxml2 split a paragraph."""
+        parser = lxml_html.HTMLParser(encoding="utf-8")
+        document = lxml_html.document_fromstring(html.encode("utf-8"), parser=parser)
+        if any(self._closes_split_paragraph(error) for error in parser.error_log):
+            return None
+        return document
+
+    def _closes_split_paragraph(self, error) -> bool:
+        # A block element implicitly closed the paragraph, so its real end tag
+        # no longer matches anything.
+        return (
+            error.type == lxml_etree.ErrorTypes.ERR_TAG_NAME_MISMATCH
+            and error.message.rstrip().endswith(": p")
+        )
+
+    @classmethod
+    def _text(cls, element, separator: str = "") -> str:
+        strings = (text.strip() for text in element.xpath(cls._TEXT))
+        return separator.join(text for text in strings if text)
+
+    def _first_text(self, card, path: str, default: str) -> str:
+        found = card.xpath(path)
+        return self._text(found[0]) if found else default
+
+    def _has_class_token(self, element, name: str) -> bool:
+        return name in (element.get("class") or "").split()
+
+    def parse_search_results(self, html: str) -> list[Course]:
+        """Parse HTML search results into Course objects."""
+        if not html.strip():
+            return []
+        document = self._document(html)
+        if document is None:
+            return self._fallback.parse_search_results(html)
+
+        courses: list[Course] = []
+        seen_links = set()
+
+        for card in document.xpath(self._CARDS):
+            link = next(card.iterancestors("a"), None)
+            while link is not None and link.get("href") is None:
+                link = next(link.iterancestors("a"), None)
+            if link is None or link in seen_links:
+                continue
+            seen_links.add(link)
+
+            course_url = link.get("href")
+            code = _course_code(course_url)
+            if not code:
+                continue
+
+            courses.append(
+                Course(
+                    title=self._first_text(card, self._TITLE, "Unknown Title"),
+                    url=course_url,
+                    code=code,
+                    instructor=self._first_text(
+                        card, self._INSTRUCTOR, "Unknown Instructor"
+                    ),
+                    institute=self._first_text(
+                        card, self._INSTITUTE, "Unknown Institute"
+                    ),
+                    nc_code=self._first_text(card, self._NC_CODE, "Unknown NC"),
+                )
+            )
+
+        return courses
+
+    def _script_text(self, date_p) -> str | None:
+        scripts = date_p.xpath(".//script")
+        return scripts[0].text if scripts and scripts[0].text else None
+
+    def _date_text(self, date_p) -> str:
+        parts: list[str] = []
+        if date_p.text:
+            parts.append(date_p.text.strip())
+
+        for child in date_p:
+            if child.tag is lxml_etree.Comment:
+                parts.append((child.text or "").strip())
+            elif child.tag != "script" and isinstance(child.tag, str):
+                parts.append(self._text(child))
+            if child.tail:
+                parts.append(child.tail.strip())
+
+        date_text = " ".join(filter(None, parts))
+        if date_text:
+            return date_text
+
+        # Like SoupParser, a date paragraph without text gives an empty date
+        # unless its script carries a timestamp.
+        script_text = self._script_text(date_p)
+        return (script_text and _date_from_script(script_text)) or ""
+
+    def parse_announcements(self, html: str) -> list[Announcement]:
+        """Parse HTML announcements into Announcement objects."""
+        if not html.strip():
+            return []
+        document = self._document(html)
+        if document is None:
+            return self._fallback.parse_announcements(html)
+
+        announcements: list[Announcement] = []
+
+        for title_span in document.xpath(self._ANNOUNCEMENT_TITLES):
+            h2 = title_span.getparent()
+            if h2 is None:
+                continue
+
+            title_text = self._text(title_span)
+
+            date_p = next(h2.itersiblings("p"), None)
+            date_text = "Unknown Date"
+            script_text = None
+            content_text = ""
+            if date_p is not None:
+                date_text = self._date_text(date_p)
+                script_text = self._script_text(date_p)
+                content_p = next(
+                    (
+                        sibling
+                        for sibling in date_p.itersiblings("p")
+                        if self._has_class_token(sibling, "gcb-announcement-content")
+                    ),
+                    None,
+                )
+                if content_p is not None:
+                    content_text = self._text(content_p, separator="\n")
+
+            announcements.append(
+                Announcement(
+                    title=title_text,
+                    date=date_text,
+                    content=content_text,
+                    published_at=parse_published_at(date_text, script_text),
+                )
+            )
+
+        return announcements
+
+
+def get_parser(name: str = "auto") -> HtmlParser:
+    """Return the parser backend called ``name``.
+
+    ``auto`` picks lxml when it is installed and falls back to BeautifulSoup.
+    """
+    if name == "soup":
+        return SoupParser()
+    if name == "lxml":
+        return LxmlParser()
+    if name != "auto":
+        raise ValueError(f"Unknown HTML parser backend: {name}")
+
+    try:
+        return LxmlParser()
+    except ImportError:
+        return SoupParser()
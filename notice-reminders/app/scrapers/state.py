@@ -0,0 +1,62 @@
+"""State the scraper keeps between fetches, behind pluggable stores."""
+
+from dataclasses import dataclass
+from typing import Protocol, final
+
+
+@dataclass
+class PageValidators:
+    """Cache validators and body hash of the last successful page fetch."""
+
+    etag: str | None
+    last_modified: str | None
+    body_hash: str
+
+
+class ValidatorStore(Protocol):
+    """Storage for per-URL page validators."""
+
+    async def get(self, url: str) -> PageValidators | None: ...
+
+    async def set(self, url: str, validators: PageValidators) -> None: ...
+
+
+@final
+class MemoryValidatorStore:
+    """Process-local validator store; forgets everything on restart."""
+
+    def __init__(self) -> None:
+        self._entries: dict[str, PageValidators] = {}
+
+    async def get(self, url: str) -> PageValidators | None:
+        return self._entries.get(url)
+
+    async def set(self, url: str, validators: PageValidators) -> None:
+        self._entries[url] = validators
+
+
+class HostStore(Protocol):
+    """Storage for the mirror base URL that serves each course."""
+
+    async def get(self, course_code: str) -> str | None: ...
+
+    async def set(self, course_code: str, base_url: str) -> None: ...
+
+    async def invalidate(self, course_code: str) -> None: ...
+
+
+@final
+class MemoryHostStore:
+    """Process-local host store; forgets everything on restart."""
+
+    def __init__(self) -> None:
+        self._entries: dict[str, str] = {}
+
+    async def get(self, course_code: str) -> str | None:
+        return self._entries.get(course_code)
+
+    async def set(self, course_code: str, base_url: str) -> None:
+        self._entries[course_code] = base_url
+
+    async def invalidate(self, course_code: str) -> None:
+        self._entries.pop(course_code, None)
@@ -1,44 +1,265 @@
-from typing import final
+import logging
+from collections.abc import AsyncIterator, Sequence
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import partial
+from typing import Any, final
 
-from tortoise.expressions import Q
+from tortoise.functions import Count, Max
+from tortoise.queryset import QuerySet
+from tortoise.transactions import in_transaction
 
 from app.core.config import Settings
-from app.models.announcement import Announcement
+from app.core.metrics import ROWS_WRITTEN
+from app.core.pagination import Page, PageRequest, fingerprint, paginate_values
+from app.core.singleflight import SingleFlight
+from app.core.write_queue import WriteQueue, submit_write
+from app.domain.models import Announcement as ScrapedAnnouncement
+from app.models.announcement import Announcement, content_hash, identity_hash
 from app.models.course import Course
+from app.scrapers import AnnouncementPage
+from app.services.notification_service import NotificationService
+from app.services.search_index import SearchIndex
 from app.services.swayam_service import SwayamService
 
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SyncResult:
+    announcements: list[Announcement]
+    created: list[Announcement] = field(default_factory=list)
+    updated: list[Announcement] = field(default_factory=list)
+    # True when the course had no stored announcements before this sync.
+    initial: bool = False
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.created or self.updated)
+
 
 @final
 class AnnouncementService:
-    def __init__(self, settings: Settings, swayam_service: SwayamService) -> None:
+    def __init__(
+        self,
+        settings: Settings,
+        swayam_service: SwayamService,
+        flights: SingleFlight | None = None,
+        notification_service: NotificationService | None = None,
+        search_index: SearchIndex | None = None,
+        write_queue: WriteQueue | None = None,
+    ) -> None:
         self.settings = settings
         self.swayam_service = swayam_service
+        self.flights = flights if flights is not None else SingleFlight()
+        self.notification_service = notification_service
+        self.search_index = search_index
+        self.write_queue = write_queue
 
     async def fetch_and_cache(self, course: Course) -> list[Announcement]:
-        announcements = await self.swayam_service.get_announcements(course.code)
-        stored: list[Announcement] = []
+        result = await self.refresh(course)
+        return list(result.announcements)
 
-        for item in announcements:
-            record = await Announcement.get_or_none(
-                Q(course=course) & Q(title=item.title) & Q(date=item.date)
-            )
+    async def refresh(self, course: Course) -> SyncResult:
+        return await self.flights.do(
+            ("announcements", course.code), lambda: self._refresh(course)
+        )
 
-            if record:
-                if record.content != item.content:
-                    record.content = item.content
-                    await record.save()
-                stored.append(record)
+    async def refresh_many(
+        self, courses: Sequence[Course]
+    ) -> AsyncIterator[tuple[Course, SyncResult | Exception]]:
+        """Refresh many courses, yielding each result as it is stored.
+
+        Pages come from the scraper's bounded concurrent fetch, and each one
+        is stored before the next is taken. A course that fails yields its
+        error instead of aborting the rest.
+        """
+        by_code = {course.code: course for course in courses}
+        pages = self.swayam_service.get_announcements_many(by_code, conditional=True)
+        async for code, page in pages:
+            course = by_code[code]
+            if isinstance(page, Exception):
+                yield course, page
                 continue
+            try:
+                result = await self.flights.do(
+                    ("announcements", code), partial(self._apply, course, page)
+                )
+            # Same as a failed fetch: reported for this course only.
+            except Exception as exc:  # noqa: BLE001
+                yield course, exc
+            else:
+                yield course, result
+
+    async def _refresh(self, course: Course) -> SyncResult:
+        page = await self.swayam_service.get_announcements_if_changed(course.code)
+        return await self._apply(course, page)
+
+    async def _apply(self, course: Course, page: AnnouncementPage | None) -> SyncResult:
+        """Store a conditionally fetched ``page``; None means it is unchanged."""
+        if page is None:
+            result = SyncResult(await self.list_for_course(course))
+            if not result.announcements:
+                announcements = await self.swayam_service.get_announcements(course.code)
+                result = await self._store(course, announcements)
+        else:
+            result = await self._store(course, page.announcements)
+            await self.swayam_service.save_validators(page)
+
+        await self._mark_refreshed(course)
+        return result
+
+    async def _mark_refreshed(self, course: Course) -> None:
+        course.announcements_refreshed_at = datetime.now(timezone.utc)
+        await Course.filter(pk=course.pk).update(
+            announcements_refreshed_at=course.announcements_refreshed_at
+        )
+
+    def data_age_seconds(self, course: Course) -> float | None:
+        if course.announcements_refreshed_at is None:
+            return None
+
+        age = datetime.now(timezone.utc) - course.announcements_refreshed_at
+        return max(age.total_seconds(), 0.0)
+
+    def is_stale(self, course: Course) -> bool:
+        age = self.data_age_seconds(course)
+        return age is None or age > self.settings.cache_ttl_minutes * 60
+
+    async def refresh_in_background(self, course: Course) -> None:
+        try:
+            await self.fetch_and_cache(course)
+        except Exception:
+            logger.exception("Background refresh failed for course %s", course.code)
+
+    async def _store(
+        self, course: Course, announcements: list[ScrapedAnnouncement]
+    ) -> SyncResult:
+        return await submit_write(
+            self.write_queue, lambda: self._sync(course, announcements)
+        )
 
-            stored.append(
-                await Announcement.create(
-                    course=course,
-                    title=item.title,
-                    date=item.date,
-                    content=item.content,
+    async def _sync(
+        self, course: Course, announcements: list[ScrapedAnnouncement]
+    ) -> SyncResult:
+        keys = [identity_hash(item.title, item.date) for item in announcements]
+
+        async with in_transaction() as connection:
+            existing = {
+                record.identity_hash: record
+                for record in await Announcement.filter(
+                    course=course, identity_hash__in=set(keys)
+                )
+            }
+            created: dict[str, Announcement] = {}
+            updated: dict[int, Announcement] = {}
+            now = datetime.now(timezone.utc)
+
+            for key, item in zip(keys, announcements):
+                record = existing.get(key) or created.get(key)
+                digest = content_hash(item.content)
+
+                if record is None:
+                    created[key] = Announcement(
+                        course=course,
+                        title=item.title,
+                        date=item.date,
+                        content=item.content,
+                        identity_hash=key,
+                        content_hash=digest,
+                        published_at=item.published_at,
+                    )
+                elif record.content_hash != digest or (
+                    record.published_at is None and item.published_at is not None
+                ):
+                    record.content = item.content
+                    record.content_hash = digest
+                    record.published_at = record.published_at or item.published_at
+                    record.updated_at = now
+                    if record.pk is not None:
+                        updated[record.pk] = record
+
+            if created:
+                initial = not await Announcement.filter(course=course).exists()
+                await Announcement.bulk_create(list(created.values()))
+            if updated:
+                await Announcement.bulk_update(
+                    list(updated.values()),
+                    fields=["content", "content_hash", "published_at", "updated_at"],
+                )
+            ROWS_WRITTEN.inc(len(created), model="announcement", action="inserted")
+            ROWS_WRITTEN.inc(len(updated), model="announcement", action="updated")
+
+            if created:
+                # bulk_create does not populate primary keys on every backend.
+                records = {
+                    record.identity_hash: record
+                    for record in await Announcement.filter(
+                        course=course, identity_hash__in=set(keys)
+                    )
+                }
+                result = SyncResult(
+                    [records[key] for key in keys],
+                    created=[records[key] for key in created],
+                    updated=[
+                        records[record.identity_hash] for record in updated.values()
+                    ],
+                    initial=initial,
                 )
-            )
-        return stored
+            else:
+                result = SyncResult(
+                    [existing[key] for key in keys], updated=list(updated.values())
+                )
+
+            if self.search_index is not None:
+                await self.search_index.index_announcements(
+                    [*result.created, *result.updated], connection
+                )
+
+            # The first sync of a course backfills its history; only
+            # announcements that appear after that are news worth notifying
+            # about. Notifications commit with the announcements, so a failed
+            # fan-out is retried by the next sync, which sees them as new again.
+            if result.created and not result.initial and self.notification_service:
+                await self.notification_service.fan_out(result.created)
+            return result
+
+    async def list_for_course(
+        self, course: Course, since: datetime | None = None
+    ) -> list[Announcement]:
+        """Newest first; ``since`` keeps announcements published at or after it.
+
+        Announcements whose date could not be parsed are excluded by ``since``.
+        """
+        query = Announcement.filter(course=course)
+        if since is not None:
+            query = query.filter(published_at__gte=since)
+        return await query.order_by("-published_at", "-id")
+
+    async def page_for_course(
+        self,
+        course: Course,
+        page: PageRequest,
+        fields: Sequence[str],
+        since: datetime | None = None,
+    ) -> Page[dict[str, Any]]:
+        return await paginate_values(
+            self._for_course(course, since), "-published_at", page, fields
+        )
+
+    async def version_for_course(
+        self, course: Course, since: datetime | None = None
+    ) -> tuple[object, ...]:
+        return await fingerprint(
+            self._for_course(course, since),
+            count=Count("id"),
+            updated_at=Max("updated_at"),
+        )
 
-    async def list_for_course(self, course: Course) -> list[Announcement]:
-        return await Announcement.filter(course=course).order_by("-fetched_at")
+    def _for_course(
+        self, course: Course, since: datetime | None
+    ) -> QuerySet[Announcement]:
+        query = Announcement.filter(course=course)
+        if since is not None:
+            query = query.filter(published_at__gte=since)
+        return query
@@ -1,59 +1,188 @@
+from collections.abc import Sequence
 from datetime import datetime, timedelta, timezone
-from typing import final
+from typing import Any, final
 
 from tortoise.expressions import Q
+from tortoise.functions import Count, Max
+from tortoise.queryset import QuerySet
+from tortoise.transactions import in_transaction
 
+from app.core.cache import TTLCache
 from app.core.config import Settings
+from app.core.metrics import ROWS_WRITTEN
+from app.core.pagination import Page, PageRequest, fingerprint, paginate_values
+from app.core.singleflight import SingleFlight
+from app.core.write_queue import WriteQueue, submit_write
+from app.domain.models import Course as ScrapedCourse
 from app.models.course import Course
+from app.services.search_index import SearchIndex
 from app.services.swayam_service import SwayamService
 
+SYNCED_FIELDS = ("title", "url", "instructor", "institute", "nc_code")
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.split()).casefold()
+
 
 @final
 class CourseService:
-    def __init__(self, settings: Settings, swayam_service: SwayamService) -> None:
+    def __init__(
+        self,
+        settings: Settings,
+        swayam_service: SwayamService,
+        search_cache: TTLCache[str, tuple[str, ...]] | None = None,
+        flights: SingleFlight | None = None,
+        search_index: SearchIndex | None = None,
+        write_queue: WriteQueue | None = None,
+    ) -> None:
         self.settings = settings
         self.swayam_service = swayam_service
+        self.search_cache = search_cache
+        self.flights = flights if flights is not None else SingleFlight()
+        self.search_index = search_index
+        self.write_queue = write_queue
 
     async def search_and_cache(self, query: str) -> list[Course]:
+        key = normalize_query(query)
+        cached = await self._cached_search(key)
+        if cached is not None:
+            return cached
+
+        stored = await self.flights.do(
+            ("search", key), lambda: self._search_and_sync(query, key)
+        )
+        return list(stored)
+
+    async def _search_and_sync(self, query: str, key: str) -> list[Course]:
         courses = await self.swayam_service.search_courses(query)
-        stored: list[Course] = []
+        stored = await submit_write(self.write_queue, lambda: self._sync(courses))
+
+        if self.search_cache is not None:
+            self.search_cache.set(key, tuple(record.code for record in stored))
+        return stored
+
+    async def _cached_search(self, key: str) -> list[Course] | None:
+        if self.search_cache is None:
+            return None
+
+        codes = self.search_cache.get(key)
+        if codes is None:
+            return None
+        if not codes:
+            return []
+
+        records = {
+            record.code: record for record in await Course.filter(code__in=set(codes))
+        }
+        if any(code not in records for code in codes):
+            self.search_cache.invalidate(key)
+            return None
+
+        return [records[code] for code in codes]
 
-        for course in courses:
-            record = await Course.get_or_none(code=course.code)
+    async def _sync(self, courses: list[ScrapedCourse]) -> list[Course]:
+        if not courses:
+            return []
+
+        codes = [course.code for course in courses]
+
+        async with in_transaction() as connection:
+            existing = {
+                record.code: record
+                for record in await Course.filter(code__in=set(codes))
+            }
+            created: dict[str, Course] = {}
+            updated: dict[int, Course] = {}
+            now = datetime.now(timezone.utc)
+
+            for course in courses:
+                record = existing.get(course.code) or created.get(course.code)
+
+                if record is None:
+                    created[course.code] = Course(
+                        code=course.code,
+                        title=course.title,
+                        url=course.url,
+                        instructor=course.instructor,
+                        institute=course.institute,
+                        nc_code=course.nc_code,
+                    )
+                    continue
 
-            if record:
                 changed = False
-                for field in [
-                    "title",
-                    "url",
-                    "instructor",
-                    "institute",
-                    "nc_code",
-                ]:
+                for field in SYNCED_FIELDS:
                     if getattr(record, field) != getattr(course, field):
                         setattr(record, field, getattr(course, field))
                         changed = True
 
-                if changed:
-                    await record.save()
+                if changed and record.pk is not None:
+                    record.updated_at = now
+                    updated[record.pk] = record
+
+            if created:
+                await Course.bulk_create(list(created.values()))
+            if updated:
+                await Course.bulk_update(
+                    list(updated.values()), fields=[*SYNCED_FIELDS, "updated_at"]
+                )
+            ROWS_WRITTEN.inc(len(created), model="course", action="inserted")
+            ROWS_WRITTEN.inc(len(updated), model="course", action="updated")
 
-                stored.append(record)
-                continue
+            if created:
+                # bulk_create does not populate primary keys on every backend.
+                existing = {
+                    record.code: record
+                    for record in await Course.filter(code__in=set(codes))
+                }
 
-            stored.append(
-                await Course.create(
-                    code=course.code,
-                    title=course.title,
-                    url=course.url,
-                    instructor=course.instructor,
-                    institute=course.institute,
-                    nc_code=course.nc_code,
+            if self.search_index is not None:
+                await self.search_index.index_courses(
+                    [existing[code] for code in created]
+                    + [existing[record.code] for record in updated.values()],
+                    connection,
                 )
-            )
-        return stored
 
-    async def list_courses(self) -> list[Course]:
-        return await Course.all().order_by("title")
+        return [existing[code] for code in codes]
+
+    async def list_courses(
+        self,
+        page: PageRequest,
+        fields: Sequence[str],
+        nc_code: str | None = None,
+        institute: str | None = None,
+        ids: Sequence[int] | None = None,
+    ) -> Page[dict[str, Any]]:
+        return await paginate_values(
+            self._filter(nc_code, institute, ids), "title", page, fields
+        )
+
+    async def list_version(
+        self,
+        nc_code: str | None = None,
+        institute: str | None = None,
+        ids: Sequence[int] | None = None,
+    ) -> tuple[object, ...]:
+        return await fingerprint(
+            self._filter(nc_code, institute, ids),
+            count=Count("id"),
+            updated_at=Max("updated_at"),
+        )
+
+    def _filter(
+        self,
+        nc_code: str | None,
+        institute: str | None,
+        ids: Sequence[int] | None = None,
+    ) -> QuerySet[Course]:
+        query = Course.all()
+        if nc_code is not None:
+            query = query.filter(nc_code=nc_code)
+        if institute is not None:
+            query = query.filter(institute=institute)
+        if ids is not None:
+            query = query.filter(id__in=list(ids))
+        return query
 
     async def get_by_code(self, course_code: str) -> Course | None:
         return await Course.get_or_none(code=course_code)
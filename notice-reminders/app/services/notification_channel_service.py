@@ -1,6 +1,6 @@
 from tortoise.exceptions import IntegrityError
 
-from app.models.notification_channel import NotificationChannel
+from app.models.notification_channel import DigestMode, NotificationChannel
 from app.models.user import User
 
 
@@ -13,17 +13,23 @@ class NotificationChannelService:
         user: User,
         channel: str,
         address: str,
+        digest: DigestMode = DigestMode.IMMEDIATE,
     ) -> NotificationChannel:
         try:
             return await NotificationChannel.create(
                 user=user,
                 channel=channel,
                 address=address,
+                digest=digest,
             )
         except IntegrityError:
-            return await NotificationChannel.get(
+            existing = await NotificationChannel.get(
                 user=user, channel=channel, address=address
             )
+            if existing.digest != digest:
+                existing.digest = digest
+                await existing.save(update_fields=["digest"])
+            return existing
 
     async def disable(self, channel: NotificationChannel) -> NotificationChannel:
         channel.is_active = False
@@ -1,30 +1,153 @@
+from collections.abc import Sequence
+from datetime import datetime, timezone
+from typing import Any
+
+from tortoise.expressions import Q
+from tortoise.functions import Count, Max
+from tortoise.queryset import QuerySet
+
+from app.core.pagination import Page, PageRequest, fingerprint, paginate_values
+from app.core.write_queue import WriteQueue, submit_write
 from app.models.announcement import Announcement
-from app.models.notification import Notification
+from app.models.notification import Notification, NotificationStatus
 from app.models.notification_channel import NotificationChannel
 from app.models.subscription import Subscription
 
 
 class NotificationService:
+    def __init__(self, write_queue: WriteQueue | None = None) -> None:
+        self.write_queue = write_queue
+
     async def create(
         self,
         subscription: Subscription,
         announcement: Announcement,
         channel: NotificationChannel | None,
     ) -> Notification:
-        return await Notification.create(
-            user=subscription.user,
-            subscription=subscription,
-            announcement=announcement,
-            channel=channel,
+        return await submit_write(
+            self.write_queue,
+            lambda: Notification.create(
+                user=subscription.user,
+                subscription=subscription,
+                announcement=announcement,
+                channel=channel,
+                # In-app notifications have nothing to send, so they start
+                # delivered.
+                status=NotificationStatus.PENDING
+                if channel
+                else NotificationStatus.SENT,
+                delivered_at=None if channel else datetime.now(timezone.utc),
+            ),
+        )
+
+    async def fan_out(self, announcements: Sequence[Announcement]) -> int:
+        """Create notifications for every active subscriber of new announcements.
+
+        Users get one notification per active channel, or a single in-app
+        notification when they have none. Notifications that already exist
+        are skipped, so re-running for the same announcements is a no-op.
+        Returns the number of notifications created.
+        """
+        announcement_ids: dict[int, list[int]] = {}
+        for announcement in announcements:
+            announcement_ids.setdefault(announcement.course_id, []).append(
+                announcement.id
+            )
+        if not announcement_ids:
+            return 0
+
+        course_ids = list(announcement_ids)
+        subscriptions = await Subscription.filter(
+            course_id__in=course_ids, is_active=True
+        ).values_list("id", "user_id", "course_id")
+        if not subscriptions:
+            return 0
+
+        channels: dict[int, list[int]] = {}
+        for channel_id, user_id in (
+            await NotificationChannel.filter(
+                is_active=True,
+                user__subscriptions__course_id__in=course_ids,
+                user__subscriptions__is_active=True,
+            )
+            .distinct()
+            .values_list("id", "user_id")
+        ):
+            channels.setdefault(user_id, []).append(channel_id)
+
+        existing = set(
+            await Notification.filter(
+                announcement_id__in=[announcement.id for announcement in announcements]
+            ).values_list("announcement_id", "user_id", "channel_id")
         )
 
+        now = datetime.now(timezone.utc)
+        rows: list[Notification] = []
+        for subscription_id, user_id, course_id in subscriptions:
+            for announcement_id in announcement_ids[course_id]:
+                for channel_id in channels.get(user_id) or [None]:
+                    key = (announcement_id, user_id, channel_id)
+                    if key in existing:
+                        continue
+                    existing.add(key)
+                    rows.append(
+                        Notification(
+                            user_id=user_id,
+                            subscription_id=subscription_id,
+                            announcement_id=announcement_id,
+                            channel_id=channel_id,
+                            status=NotificationStatus.PENDING
+                            if channel_id
+                            else NotificationStatus.SENT,
+                            delivered_at=None if channel_id else now,
+                        )
+                    )
+
+        if rows:
+            await Notification.bulk_create(rows, batch_size=1000, ignore_conflicts=True)
+        return len(rows)
+
     async def list_notifications(self) -> list[Notification]:
         return await Notification.all().order_by("-sent_at")
 
-    async def list_for_user(self, user_id: int) -> list[Notification]:
-        return await Notification.filter(user_id=user_id).order_by("-sent_at")
+    async def list_for_user(
+        self,
+        user_id: int,
+        page: PageRequest,
+        fields: Sequence[str],
+        is_read: bool | None = None,
+    ) -> Page[dict[str, Any]]:
+        return await paginate_values(
+            self._for_user(user_id, is_read), "-sent_at", page, fields
+        )
+
+    async def version_for_user(
+        self, user_id: int, is_read: bool | None = None
+    ) -> tuple[object, ...]:
+        # Notifications only ever become read, and only ever move from pending
+        # to sending and back until they settle, so these counts change
+        # whenever a listed row does.
+        return await fingerprint(
+            self._for_user(user_id, is_read),
+            count=Count("id"),
+            sent_at=Max("sent_at"),
+            read=Count("id", _filter=Q(is_read=True)),
+            sending=Count("id", _filter=Q(status=NotificationStatus.SENDING)),
+            settled=Count(
+                "id",
+                _filter=Q(
+                    status__in=[NotificationStatus.SENT, NotificationStatus.FAILED]
+                ),
+            ),
+        )
+
+    def _for_user(self, user_id: int, is_read: bool | None) -> QuerySet[Notification]:
+        query = Notification.filter(user_id=user_id)
+        if is_read is not None:
+            query = query.filter(is_read=is_read)
+        return query
 
     async def mark_read(self, notification: Notification) -> Notification:
         notification.is_read = True
-        await notification.save()
+        await submit_write(self.write_queue, notification.save)
         return notification
@@ -0,0 +1,61 @@
+"""Database-backed stores for scraper state."""
+
+from typing import final
+
+from app.models.course import Course
+from app.models.page_validator import PageValidator
+from app.scrapers.state import PageValidators
+
+
+@final
+class DatabaseValidatorStore:
+    """Validator store persisted in the ``page_validators`` table."""
+
+    async def get(self, url: str) -> PageValidators | None:
+        record = await PageValidator.get_or_none(url=url)
+        if not record:
+            return None
+
+        return PageValidators(
+            etag=record.etag,
+            last_modified=record.last_modified,
+            body_hash=record.body_hash,
+        )
+
+    async def set(self, url: str, validators: PageValidators) -> None:
+        await PageValidator.update_or_create(
+            defaults={
+                "etag": validators.etag,
+                "last_modified": validators.last_modified,
+                "body_hash": validators.body_hash,
+            },
+            url=url,
+        )
+
+
+@final
+class DatabaseHostStore:
+    """Host store persisted on ``Course.announcement_host``.
+
+    Lookups are memoised in-process so a fetch does not cost an extra query.
+    """
+
+    def __init__(self) -> None:
+        self._cache: dict[str, str | None] = {}
+
+    async def get(self, course_code: str) -> str | None:
+        if course_code not in self._cache:
+            self._cache[course_code] = (
+                await Course.filter(code=course_code)
+                .first()
+                .values_list("announcement_host", flat=True)
+            )
+        return self._cache[course_code]
+
+    async def set(self, course_code: str, base_url: str) -> None:
+        self._cache[course_code] = base_url
+        await Course.filter(code=course_code).update(announcement_host=base_url)
+
+    async def invalidate(self, course_code: str) -> None:
+        self._cache[course_code] = None
+        await Course.filter(code=course_code).update(announcement_host=None)
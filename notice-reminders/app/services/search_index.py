@@ -0,0 +1,253 @@
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Literal, final
+
+from tortoise import Tortoise
+from tortoise.backends.base.client import BaseDBAsyncClient
+from tortoise.exceptions import OperationalError
+from tortoise.expressions import Q
+
+from app.models.announcement import Announcement
+from app.models.course import Course
+
+SearchKind = Literal["course", "announcement"]
+
+_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS "courses_fts" USING fts5(
+    title, instructor, institute, tokenize = 'unicode61 remove_diacritics 2'
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS "announcements_fts" USING fts5(
+    title, content, tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+_BACKFILL = {
+    "courses_fts": (
+        'INSERT INTO "courses_fts" (rowid, title, instructor, institute) '
+        'SELECT "id", "title", "instructor", "institute" FROM "courses"'
+    ),
+    "announcements_fts": (
+        'INSERT INTO "announcements_fts" (rowid, title, content) '
+        'SELECT "id", "title", "content" FROM "announcements"'
+    ),
+}
+
+_COURSE_HITS = """
+SELECT 'course' AS kind, c."id" AS id, c."code" AS course_code, c."title" AS title,
+       snippet("courses_fts", -1, '[', ']', '...', 16) AS snippet,
+       bm25("courses_fts") AS score
+FROM "courses_fts" JOIN "courses" AS c ON c."id" = "courses_fts".rowid
+WHERE "courses_fts" MATCH ? AND (? IS NULL OR c."code" = ?)
+"""
+
+_ANNOUNCEMENT_HITS = """
+SELECT 'announcement' AS kind, a."id" AS id, c."code" AS course_code,
+       a."title" AS title,
+       snippet("announcements_fts", 1, '[', ']', '...', 16) AS snippet,
+       bm25("announcements_fts", 2.0, 1.0) AS score
+FROM "announcements_fts"
+JOIN "announcements" AS a ON a."id" = "announcements_fts".rowid
+JOIN "courses" AS c ON c."id" = a."course_id"
+WHERE "announcements_fts" MATCH ? AND (? IS NULL OR c."code" = ?)
+"""
+
+
+@dataclass
+class SearchHit:
+    kind: SearchKind
+    id: int
+    course_code: str
+    title: str
+    snippet: str
+    # bm25 relevance; lower is better. Always 0.0 without full-text support.
+    score: float
+
+
+def fts_query(text: str) -> str:
+    """Quote every term so user input is never parsed as FTS5 syntax."""
+    return " ".join('"' + term.replace('"', '""') + '"' for term in text.split())
+
+
+@final
+class SearchIndex:
+    """Full-text index over cached courses and announcements.
+
+    Uses SQLite FTS5 tables keyed by the source rows' ids. On other databases,
+    or SQLite builds without FTS5, searches fall back to substring matching
+    and the index methods do nothing.
+    """
+
+    def __init__(self, connection_name: str = "default") -> None:
+        self.connection_name = connection_name
+        self.enabled = False
+
+    def _connection(
+        self, connection: BaseDBAsyncClient | None = None
+    ) -> BaseDBAsyncClient:
+        return connection or Tortoise.get_connection(self.connection_name)
+
+    async def setup(self) -> None:
+        """Create the FTS tables, populating any that did not exist yet."""
+        connection = self._connection()
+        if connection.capabilities.dialect != "sqlite":
+            return
+
+        rows = await connection.execute_query_dict(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name IN "
+            "('courses_fts', 'announcements_fts')"
+        )
+        existing = {row["name"] for row in rows}
+        try:
+            await connection.execute_script(_SCHEMA)
+        except OperationalError:
+            # SQLite was built without FTS5.
+            return
+
+        for table, backfill in _BACKFILL.items():
+            if table not in existing:
+                await connection.execute_script(backfill)
+        self.enabled = True
+
+    async def index_courses(
+        self,
+        courses: Sequence[Course],
+        connection: BaseDBAsyncClient | None = None,
+    ) -> None:
+        await self._replace(
+            "courses_fts",
+            ("title", "instructor", "institute"),
+            [
+                [course.id, course.title, course.instructor, course.institute]
+                for course in courses
+            ],
+            connection,
+        )
+
+    async def index_announcements(
+        self,
+        announcements: Sequence[Announcement],
+        connection: BaseDBAsyncClient | None = None,
+    ) -> None:
+        await self._replace(
+            "announcements_fts",
+            ("title", "content"),
+            [[item.id, item.title, item.content] for item in announcements],
+            connection,
+        )
+
+    async def _replace(
+        self,
+        table: str,
+        columns: tuple[str, ...],
+        rows: list[list[object]],
+        connection: BaseDBAsyncClient | None,
+    ) -> None:
+        if not self.enabled or not rows:
+            return
+
+        connection = self._connection(connection)
+        ids = [row[0] for row in rows]
+        await connection.execute_query(
+            f'DELETE FROM "{table}" WHERE rowid IN ({", ".join("?" * len(ids))})',
+            ids,
+        )
+        placeholders = ", ".join("?" * (len(columns) + 1))
+        await connection.execute_many(
+            f'INSERT INTO "{table}" (rowid, {", ".join(columns)}) '
+            f"VALUES ({placeholders})",
+            rows,
+        )
+
+    async def search(
+        self,
+        text: str,
+        kind: SearchKind | None = None,
+        course_code: str | None = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> list[SearchHit]:
+        """Best matches first; ``kind`` restricts results to one table."""
+        if not text.split():
+            return []
+        if not self.enabled:
+            return await self._search_fallback(text, kind, course_code, limit, offset)
+
+        match = fts_query(text)
+        selects: list[str] = []
+        values: list[object] = []
+        if kind in (None, "course"):
+            selects.append(_COURSE_HITS)
+            values += [match, course_code, course_code]
+        if kind in (None, "announcement"):
+            selects.append(_ANNOUNCEMENT_HITS)
+            values += [match, course_code, course_code]
+
+        rows = await self._connection().execute_query_dict(
+            " UNION ALL ".join(selects) + " ORDER BY score, id LIMIT ? OFFSET ?",
+            [*values, limit, offset],
+        )
+        return [SearchHit(**row) for row in rows]
+
+    async def _search_fallback(
+        self,
+        text: str,
+        kind: SearchKind | None,
+        course_code: str | None,
+        limit: int,
+        offset: int,
+    ) -> list[SearchHit]:
+        # Without a relevance score, courses come first and then the newest
+        # announcements; each term must appear in one of the indexed fields.
+        terms = text.split()
+        hits: list[SearchHit] = []
+        window = offset + limit
+
+        if kind in (None, "course"):
+            query = Course.filter(
+                *(
+                    Q(title__icontains=term)
+                    | Q(instructor__icontains=term)
+                    | Q(institute__icontains=term)
+                    for term in terms
+                )
+            )
+            if course_code is not None:
+                query = query.filter(code=course_code)
+            for course in await query.order_by("title").limit(window):
+                hits.append(
+                    SearchHit(
+                        "course",
+                        course.id,
+                        course.code,
+                        course.title,
+                        course.title,
+                        0.0,
+                    )
+                )
+
+        if kind in (None, "announcement") and len(hits) < window:
+            query = Announcement.filter(
+                *(
+                    Q(title__icontains=term) | Q(content__icontains=term)
+                    for term in terms
+                )
+            )
+            if course_code is not None:
+                query = query.filter(course__code=course_code)
+            for item in (
+                await query.select_related("course")
+                .order_by("-id")
+                .limit(window - len(hits))
+            ):
+                hits.append(
+                    SearchHit(
+                        "announcement",
+                        item.id,
+                        item.course.code,
+                        item.title,
+                        item.content[:200],
+                        0.0,
+                    )
+                )
+
+        return hits[offset:window]
@@ -1,5 +1,6 @@
 from tortoise.exceptions import IntegrityError
 
+from app.core.pagination import Page, PageRequest, paginate
 from app.models.course import Course
 from app.models.subscription import Subscription
 from app.models.user import User
@@ -15,8 +16,13 @@ class SubscriptionService:
     async def list_subscriptions(self) -> list[Subscription]:
         return await Subscription.all().order_by("-created_at")
 
-    async def list_for_user(self, user: User) -> list[Subscription]:
-        return await Subscription.filter(user=user).order_by("-created_at")
+    async def list_for_user(
+        self, user: User, page: PageRequest, is_active: bool | None = None
+    ) -> Page[Subscription]:
+        query = Subscription.filter(user=user)
+        if is_active is not None:
+            query = query.filter(is_active=is_active)
+        return await paginate(query, "-created_at", page)
 
     async def delete(self, subscription: Subscription) -> None:
         await subscription.delete()
@@ -1,10 +1,19 @@
 """Swayam scraping service integration."""
 
+from collections.abc import AsyncIterator, Iterable
 from typing import final
 
 from app.core.config import Settings
+from app.core.singleflight import SingleFlight
 from app.domain.models import Announcement, Course
-from app.scrapers import SwayamScraper
+from app.scrapers import AnnouncementPage, SwayamScraper
+from app.scrapers.state import (
+    HostStore,
+    MemoryHostStore,
+    MemoryValidatorStore,
+    ValidatorStore,
+)
+from app.services.scraper_state import DatabaseHostStore, DatabaseValidatorStore
 
 
 @final
@@ -13,12 +22,81 @@ class SwayamService:
 
     def __init__(self, settings: Settings) -> None:
         self.settings = settings
-        self.scraper = SwayamScraper()
+        validator_store: ValidatorStore = (
+            DatabaseValidatorStore()
+            if settings.validator_store == "database"
+            else MemoryValidatorStore()
+        )
+        host_store: HostStore = (
+            DatabaseHostStore()
+            if settings.host_store == "database"
+            else MemoryHostStore()
+        )
+        self.scraper = SwayamScraper(
+            timeout=settings.http_timeout_seconds,
+            connect_timeout=settings.http_connect_timeout_seconds,
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+            keepalive_expiry=settings.http_keepalive_expiry_seconds,
+            http2=settings.http2_enabled,
+            max_concurrency=settings.scraper_max_concurrency,
+            host_rate_limits={
+                "nptel.ac.in": (
+                    settings.nptel_rate_limit_per_second,
+                    settings.nptel_rate_limit_burst,
+                ),
+                "swayam2.ac.in": (
+                    settings.swayam2_rate_limit_per_second,
+                    settings.swayam2_rate_limit_burst,
+                ),
+            },
+            validator_store=validator_store,
+            host_store=host_store,
+            parser=settings.html_parser,
+            parse_mode=settings.parse_mode,
+            parse_workers=settings.parse_workers,
+            parse_offload_min_bytes=settings.parse_offload_min_bytes,
+        )
+        self.flights = SingleFlight()
+
+    async def open(self) -> None:
+        """Open the scraper's pooled HTTP client and parse workers."""
+        await self.scraper.open()
+
+    async def close(self) -> None:
+        """Close the scraper's pooled HTTP client and parse workers."""
+        await self.scraper.close()
 
     async def search_courses(self, query: str) -> list[Course]:
-        """Search for courses."""
-        return await self.scraper.search_courses(query)
+        """Search for courses, sharing one scrape between concurrent callers."""
+        courses = await self.flights.do(
+            ("search", query), lambda: self.scraper.search_courses(query)
+        )
+        return list(courses)
 
     async def get_announcements(self, course_code: str) -> list[Announcement]:
-        """Get announcements for a course."""
-        return await self.scraper.get_announcements(course_code)
+        """Get announcements for a course, sharing one scrape between callers."""
+        announcements = await self.flights.do(
+            ("announcements", course_code),
+            lambda: self.scraper.get_announcements(course_code),
+        )
+        return list(announcements)
+
+    async def get_announcements_if_changed(
+        self, course_code: str
+    ) -> AnnouncementPage | None:
+        """Get announcements for a course, or None if unchanged since last fetch."""
+        return await self.flights.do(
+            ("announcements_if_changed", course_code),
+            lambda: self.scraper.get_announcements_if_changed(course_code),
+        )
+
+    async def save_validators(self, page: AnnouncementPage) -> None:
+        """Mark ``page`` as seen, once its announcements are stored."""
+        await self.scraper.save_validators(page)
+
+    def get_announcements_many(
+        self, course_codes: Iterable[str], conditional: bool = False
+    ) -> AsyncIterator[tuple[str, AnnouncementPage | None | Exception]]:
+        """Get announcements for many courses, streamed as they complete."""
+        return self.scraper.get_announcements_many(course_codes, conditional)
@@ -0,0 +1,156 @@
+"""Count the queries one ``AnnouncementService.fetch_and_cache`` call makes.
+
+``before`` is the original sync: a ``get_or_none`` per scraped announcement,
+then a ``save()`` or ``create()`` for each one that changed or is new.
+``after`` is the current service, which loads the course's announcements
+once, diffs them in memory and writes with ``bulk_create`` and
+``bulk_update`` in one transaction.
+
+Both run against the same scraped page, served from memory so only database
+work is measured, in two scenarios: the first sync of a course, and a later
+sync where one announcement is new and two were edited.
+
+Run with ``uv run python -m benchmarks.announcement_sync [announcements]``.
+"""
+
+import asyncio
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from tortoise import Tortoise
+from tortoise.expressions import Q
+
+from app.core.config import Settings
+from app.core.database import get_tortoise_config
+from app.core.metrics import DB_QUERIES
+from app.core.timing import instrument_queries
+from app.domain.models import Announcement as ScrapedAnnouncement
+from app.models.announcement import Announcement, content_hash, identity_hash
+from app.models.course import Course
+from app.scrapers import AnnouncementPage
+from app.services.announcement_service import AnnouncementService
+
+
+class StaticPage:
+    """Stands in for ``SwayamService``, always serving ``announcements``."""
+
+    def __init__(self) -> None:
+        self.announcements: list[ScrapedAnnouncement] = []
+
+    async def get_announcements(self, code: str) -> list[ScrapedAnnouncement]:
+        return self.announcements
+
+    async def get_announcements_if_changed(self, code: str) -> AnnouncementPage:
+        return AnnouncementPage(url=code, announcements=self.announcements)
+
+    async def save_validators(self, page: AnnouncementPage) -> None:
+        pass
+
+
+async def fetch_and_cache_before(
+    page: StaticPage, course: Course
+) -> list[Announcement]:
+    stored: list[Announcement] = []
+    for item in await page.get_announcements(course.code):
+        record = await Announcement.get_or_none(
+            Q(course=course) & Q(title=item.title) & Q(date=item.date)
+        )
+        if record:
+            if record.content != item.content:
+                record.content = item.content
+                record.content_hash = content_hash(item.content)
+                await record.save()
+            stored.append(record)
+            continue
+
+        stored.append(
+            await Announcement.create(
+                course=course,
+                title=item.title,
+                date=item.date,
+                content=item.content,
+                identity_hash=identity_hash(item.title, item.date),
+                content_hash=content_hash(item.content),
+            )
+        )
+    return stored
+
+
+def scraped(count: int, edited: int = 0) -> list[ScrapedAnnouncement]:
+    return [
+        ScrapedAnnouncement(
+            title=f"Week {index}",
+            date=f"{index} January 2024",
+            content="Assignment deadline extended. " * 10
+            + ("(edited)" if index < edited else ""),
+        )
+        for index in range(count)
+    ]
+
+
+async def measure(
+    sync: Callable[[Course], Awaitable[Any]], course: Course
+) -> tuple[float, int]:
+    queries = DB_QUERIES.total()
+    started = time.perf_counter()
+    await sync(course)
+    return time.perf_counter() - started, int(DB_QUERIES.total() - queries)
+
+
+async def run(
+    name: str,
+    page: StaticPage,
+    sync: Callable[[Course], Awaitable[Any]],
+    announcements: int,
+) -> list[tuple[float, int]]:
+    course = await Course.create(
+        code=name,
+        title="Benchmark course",
+        url=f"https://example.com/{name}",
+        instructor="Instructor",
+        institute="Institute",
+        nc_code="NC",
+    )
+    page.announcements = scraped(announcements - 1)
+    initial = await measure(sync, course)
+    page.announcements = scraped(announcements, edited=2)
+    later = await measure(sync, course)
+
+    rows = await Announcement.filter(course=course).values_list("title", "content")
+    assert sorted(rows) == sorted(
+        (item.title, item.content) for item in page.announcements
+    ), f"{name} stored the wrong announcements"
+    return [initial, later]
+
+
+async def main(announcements: int) -> None:
+    await Tortoise.init(config=get_tortoise_config("sqlite://:memory:"))
+    await Tortoise.generate_schemas()
+    instrument_queries()
+    try:
+        page = StaticPage()
+        service = AnnouncementService(Settings(), page)  # type: ignore[arg-type]
+        before = await run(
+            "before",
+            page,
+            lambda course: fetch_and_cache_before(page, course),
+            announcements,
+        )
+        after = await run("after", page, service.fetch_and_cache, announcements)
+    finally:
+        await Tortoise.close_connections()
+
+    print(f"{announcements} announcements per page, queries per call")
+    scenarios = ("first sync", "1 new, 2 edited")
+    for scenario, (old, old_queries), (new, new_queries) in zip(
+        scenarios, before, after
+    ):
+        print(f"  {scenario}:")
+        print(f"    before: {old_queries:5d} queries  {old * 1000:8.1f} ms")
+        print(f"    after:  {new_queries:5d} queries  {new * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 80))
@@ -0,0 +1,105 @@
+"""Compare the two ways of serving a list of announcements.
+
+``before`` loads model instances, validates each into the response schema and
+lets FastAPI validate and serialize the list again against ``response_model``.
+``after`` projects the schema's columns with ``.values()`` and writes them
+straight to bytes with orjson.
+
+Run with ``uv run python -m benchmarks.list_serialization [rows]``.
+"""
+
+import asyncio
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta, timezone
+
+import httpx
+from fastapi import FastAPI, Response
+from tortoise import Tortoise
+
+from app.core.database import get_tortoise_config
+from app.core.responses import rows_response
+from app.models.announcement import Announcement
+from app.models.course import Course
+from app.schemas.announcement import AnnouncementResponse
+
+FIELDS = list(AnnouncementResponse.model_fields)
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/before", response_model=list[AnnouncementResponse])
+    async def before() -> list[AnnouncementResponse]:
+        announcements = await Announcement.all().order_by("id")
+        return [AnnouncementResponse.model_validate(item) for item in announcements]
+
+    @app.get("/after", response_model=list[AnnouncementResponse])
+    async def after(response: Response) -> Response:
+        rows = await Announcement.all().order_by("id").values(*FIELDS)
+        return rows_response(rows, response)
+
+    return app
+
+
+async def seed(rows: int) -> None:
+    course = await Course.create(
+        code="bench",
+        title="Benchmark course",
+        url="https://example.com/bench",
+        instructor="Instructor",
+        institute="Institute",
+        nc_code="NC",
+    )
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    await Announcement.bulk_create(
+        [
+            Announcement(
+                course=course,
+                title=f"Announcement {index}",
+                date=f"{index}",
+                content="Assignment deadline extended. " * 10,
+                identity_hash=f"{index:064x}",
+                content_hash="0" * 64,
+                published_at=start + timedelta(minutes=index),
+            )
+            for index in range(rows)
+        ],
+        batch_size=1000,
+    )
+
+
+async def best_of(
+    runs: int, request: Callable[[], Awaitable[httpx.Response]]
+) -> tuple[float, httpx.Response]:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        response = await request()
+        timings.append(time.perf_counter() - started)
+    return min(timings), response
+
+
+async def main(rows: int, runs: int = 5) -> None:
+    await Tortoise.init(config=get_tortoise_config("sqlite://:memory:"))
+    await Tortoise.generate_schemas()
+    try:
+        await seed(rows)
+        transport = httpx.ASGITransport(app=build_app())
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://b"
+        ) as client:
+            old, old_response = await best_of(runs, lambda: client.get("/before"))
+            new, new_response = await best_of(runs, lambda: client.get("/after"))
+    finally:
+        await Tortoise.close_connections()
+
+    assert old_response.json() == new_response.json(), "responses differ"
+    print(f"{rows} rows, best of {runs}")
+    print(f"  before: {old * 1000:8.1f} ms")
+    print(f"  after:  {new * 1000:8.1f} ms  ({old / new:.1f}x)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000))
@@ -0,0 +1,132 @@
+"""Compare two ways of notifying one course's subscribers of an announcement.
+
+``before`` loops ``NotificationService.create`` over every subscriber and
+each of their active channels, looking the channels up per subscriber.
+``after`` is ``NotificationService.fan_out``, which joins the announcement
+against subscriptions and channels in a few set-based queries and inserts
+the rows with ``bulk_create``.
+
+Half of the subscribers have an e-mail channel and the rest get an in-app
+notification, so both paths of the fan-out are exercised.
+
+Run with ``uv run python -m benchmarks.notification_fan_out [subscribers]``.
+"""
+
+import asyncio
+import sys
+import time
+from collections.abc import Awaitable, Callable
+
+from tortoise import Tortoise
+
+from app.core.database import get_tortoise_config
+from app.core.metrics import DB_QUERIES
+from app.core.timing import instrument_queries
+from app.models.announcement import Announcement
+from app.models.course import Course
+from app.models.notification import Notification
+from app.models.notification_channel import NotificationChannel
+from app.models.subscription import Subscription
+from app.models.user import User
+from app.services.notification_service import NotificationService
+
+
+async def seed(subscribers: int) -> Announcement:
+    course = await Course.create(
+        code="bench",
+        title="Benchmark course",
+        url="https://example.com/bench",
+        instructor="Instructor",
+        institute="Institute",
+        nc_code="NC",
+    )
+    await User.bulk_create(
+        [User(email=f"user{index}@example.com") for index in range(subscribers)],
+        batch_size=1000,
+    )
+    user_ids = await User.all().order_by("id").values_list("id", flat=True)
+    await Subscription.bulk_create(
+        [Subscription(user_id=user_id, course=course) for user_id in user_ids],
+        batch_size=1000,
+    )
+    await NotificationChannel.bulk_create(
+        [
+            NotificationChannel(
+                user_id=user_id, channel="email", address=f"user{user_id}@example.com"
+            )
+            for user_id in user_ids[::2]
+        ],
+        batch_size=1000,
+    )
+    return await Announcement.create(
+        course=course,
+        title="Week 1",
+        date="1 January 2024",
+        content="Assignment deadline extended.",
+        identity_hash="0" * 64,
+        content_hash="0" * 64,
+    )
+
+
+async def loop_create(service: NotificationService, announcement: Announcement) -> None:
+    for subscription in await Subscription.filter(
+        course_id=announcement.course_id, is_active=True
+    ).select_related("user"):
+        channels = await NotificationChannel.filter(
+            user_id=subscription.user_id, is_active=True
+        )
+        for channel in channels or [None]:
+            await service.create(subscription, announcement, channel)
+
+
+async def measure(run: Callable[[], Awaitable[object]]) -> tuple[float, int]:
+    await Notification.all().delete()
+    queries = DB_QUERIES.total()
+    started = time.perf_counter()
+    await run()
+    return time.perf_counter() - started, int(DB_QUERIES.total() - queries)
+
+
+async def measure_rerun(
+    service: NotificationService, announcement: Announcement
+) -> tuple[float, int]:
+    """Time a second fan-out of the same announcement, which must be a no-op."""
+    queries = DB_QUERIES.total()
+    started = time.perf_counter()
+    created = await service.fan_out([announcement])
+    elapsed = time.perf_counter() - started
+    assert created == 0, "re-running the fan-out created notifications"
+    return elapsed, int(DB_QUERIES.total() - queries)
+
+
+async def notified() -> set[tuple[int, int | None]]:
+    return set(await Notification.all().values_list("user_id", "channel_id"))
+
+
+async def main(subscribers: int) -> None:
+    await Tortoise.init(config=get_tortoise_config("sqlite://:memory:"))
+    await Tortoise.generate_schemas()
+    instrument_queries()
+    try:
+        announcement = await seed(subscribers)
+        service = NotificationService()
+
+        old, old_queries = await measure(lambda: loop_create(service, announcement))
+        old_rows = await notified()
+        new, new_queries = await measure(lambda: service.fan_out([announcement]))
+        new_rows = await notified()
+        rerun, rerun_queries = await measure_rerun(service, announcement)
+    finally:
+        await Tortoise.close_connections()
+
+    assert old_rows == new_rows, "notifications differ"
+    print(f"{subscribers} subscribers, {len(new_rows)} notifications")
+    print(f"  before: {old * 1000:8.1f} ms  {old_queries:6d} queries")
+    print(
+        f"  after:  {new * 1000:8.1f} ms  {new_queries:6d} queries  ({old / new:.1f}x)"
+    )
+    print(f"  re-run: {rerun * 1000:8.1f} ms  {rerun_queries:6d} queries, 0 inserted")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000))
@@ -44,6 +44,12 @@ def main():
         help="Enable auto-reload for development",
     )
 
+    # Poller mode
+    subparsers.add_parser(
+        "poller",
+        help="Run the background subscription poller",
+    )
+
     args = parser.parse_args()
 
     if args.mode == "cli":
@@ -61,6 +67,11 @@ def main():
             reload=args.reload,
         )
 
+    elif args.mode == "poller":
+        from app.poller import poller_main
+
+        asyncio.run(poller_main())
+
     else:
         parser.print_help()
         sys.exit(1)
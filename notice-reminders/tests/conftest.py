@@ -0,0 +1,36 @@
+import importlib.util
+import os
+from collections.abc import AsyncIterator
+from typing import Any
+
+import pytest
+
+from app.core import database
+from app.core.config import Settings
+
+# Settings requires a secret; tests never issue tokens.
+os.environ.setdefault("JWT_SECRET", "test")
+
+
+@pytest.fixture(autouse=True)
+def available_models(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Leave out model modules listed in the config that are not in this tree."""
+    get_tortoise_config = database.get_tortoise_config
+
+    def config(connection: str | dict[str, Any]) -> dict[str, Any]:
+        result = get_tortoise_config(connection)
+        app = result["apps"]["models"]
+        app["models"] = [
+            name for name in app["models"] if importlib.util.find_spec(name)
+        ]
+        return result
+
+    monkeypatch.setattr(database, "get_tortoise_config", config)
+
+
+@pytest.fixture
+async def db() -> AsyncIterator[None]:
+    """A fresh in-memory database with the current schema."""
+    await database.init_database(Settings(database_url="sqlite://:memory:"))
+    yield
+    await database.close_database()
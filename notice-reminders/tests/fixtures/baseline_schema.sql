@@ -0,0 +1,57 @@
+-- Schema generated by the first release, before any migration steps.
+CREATE TABLE "users" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "email" VARCHAR(255) NOT NULL UNIQUE,
+    "name" VARCHAR(255),
+    "telegram_id" VARCHAR(100) UNIQUE,
+    "is_active" INT NOT NULL DEFAULT 1,
+    "created_at" TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX "idx_users_email_133a6f" ON "users" ("email");
+CREATE TABLE "courses" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "code" VARCHAR(50) NOT NULL UNIQUE,
+    "title" VARCHAR(255) NOT NULL,
+    "url" VARCHAR(500) NOT NULL,
+    "instructor" VARCHAR(255) NOT NULL,
+    "institute" VARCHAR(255) NOT NULL,
+    "nc_code" VARCHAR(50) NOT NULL,
+    "created_at" TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX "idx_courses_code_e5f25c" ON "courses" ("code");
+CREATE TABLE "announcements" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "title" VARCHAR(500) NOT NULL,
+    "date" VARCHAR(50) NOT NULL,
+    "content" TEXT NOT NULL,
+    "fetched_at" TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "course_id" INT NOT NULL REFERENCES "courses" ("id") ON DELETE CASCADE
+);
+CREATE TABLE "subscriptions" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "created_at" TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "is_active" INT NOT NULL DEFAULT 1,
+    "course_id" INT NOT NULL REFERENCES "courses" ("id") ON DELETE CASCADE,
+    "user_id" INT NOT NULL REFERENCES "users" ("id") ON DELETE CASCADE,
+    CONSTRAINT "uid_subscriptio_user_id_21b498" UNIQUE ("user_id", "course_id")
+);
+CREATE TABLE "notification_channels" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "channel" VARCHAR(50) NOT NULL,
+    "address" VARCHAR(255) NOT NULL,
+    "is_active" INT NOT NULL DEFAULT 1,
+    "created_at" TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "user_id" INT NOT NULL REFERENCES "users" ("id") ON DELETE CASCADE,
+    CONSTRAINT "uid_notificatio_user_id_e8c477" UNIQUE ("user_id", "channel", "address")
+);
+CREATE TABLE "notifications" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "sent_at" TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "is_read" INT NOT NULL DEFAULT 0,
+    "announcement_id" INT NOT NULL REFERENCES "announcements" ("id") ON DELETE CASCADE,
+    "channel_id" INT REFERENCES "notification_channels" ("id") ON DELETE CASCADE,
+    "subscription_id" INT NOT NULL REFERENCES "subscriptions" ("id") ON DELETE CASCADE,
+    "user_id" INT NOT NULL REFERENCES "users" ("id") ON DELETE CASCADE
+);
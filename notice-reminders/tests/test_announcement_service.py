@@ -0,0 +1,90 @@
+import pytest
+from tortoise.exceptions import OperationalError
+
+from app.core.config import Settings
+from app.models.announcement import Announcement
+from app.models.course import Course
+from app.models.notification import Notification
+from app.models.subscription import Subscription
+from app.models.user import User
+from app.services.announcement_service import AnnouncementService
+from app.services.notification_service import NotificationService
+from app.services.swayam_service import SwayamService
+from tests.upstream import AnnouncementsServer, mock_client
+
+
+async def _course() -> Course:
+    return await Course.create(
+        code="noc24_cs01",
+        title="Algorithms",
+        url="https://example.com/noc24_cs01",
+        instructor="A",
+        institute="IIT",
+        nc_code="NC1",
+    )
+
+
+def _service(handler, notification_service=None) -> AnnouncementService:
+    settings = Settings()
+    swayam_service = SwayamService(settings)
+    swayam_service.scraper._client = mock_client(handler)
+    return AnnouncementService(
+        settings, swayam_service, notification_service=notification_service
+    )
+
+
+async def test_failed_store_is_fetched_again(
+    db: None, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    course = await _course()
+    upstream = AnnouncementsServer(["Week 1"])
+    service = _service(upstream)
+    await service.refresh(course)
+
+    upstream.titles = ["Week 2", "Week 1"]
+    sync = service._sync
+
+    async def locked(*args: object) -> None:
+        raise OperationalError("database is locked")
+
+    monkeypatch.setattr(service, "_sync", locked)
+    with pytest.raises(OperationalError):
+        await service.refresh(course)
+
+    monkeypatch.setattr(service, "_sync", sync)
+    result = await service.refresh(course)
+    assert [item.title for item in result.created] == ["Week 2"]
+    assert await Announcement.filter(course=course).count() == 2
+
+    # Stored, so the page now comes back as 304 and nothing changes.
+    assert not (await service.refresh(course)).changed
+
+
+async def test_failed_fan_out_rolls_back_the_sync(
+    db: None, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    course = await _course()
+    user = await User.create(email="a@example.com")
+    await Subscription.create(user=user, course=course)
+    upstream = AnnouncementsServer(["Week 1"])
+    notifications = NotificationService()
+    service = _service(upstream, notifications)
+    await service.refresh(course)
+
+    upstream.titles = ["Week 2", "Week 1"]
+    fan_out = notifications.fan_out
+
+    async def broken(*args: object) -> int:
+        raise OperationalError("database is locked")
+
+    monkeypatch.setattr(notifications, "fan_out", broken)
+    with pytest.raises(OperationalError):
+        await service.refresh(course)
+    assert await Announcement.filter(course=course).count() == 1
+
+    monkeypatch.setattr(notifications, "fan_out", fan_out)
+    await service.refresh(course)
+    notified = await Notification.filter(user=user).values_list(
+        "announcement__title", flat=True
+    )
+    assert notified == ["Week 2"]
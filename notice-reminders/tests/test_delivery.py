@@ -0,0 +1,157 @@
+import asyncio
+import smtplib
+from collections.abc import Sequence
+from typing import Any, ClassVar
+
+import pytest
+
+from app.core.config import Settings
+from app.delivery import DeliveryWorker
+from app.delivery.senders import DeliveryError, OutgoingMessage, SmtpSender
+from app.models.announcement import Announcement
+from app.models.course import Course
+from app.models.notification import Notification, NotificationStatus
+from app.models.notification_channel import NotificationChannel
+from app.models.subscription import Subscription
+from app.models.user import User
+
+MESSAGES = [OutgoingMessage(f"user{index}@example.com", "Hi", "") for index in range(3)]
+
+
+class SlowSender:
+    channel = "email"
+
+    def __init__(self) -> None:
+        self.sent: list[str] = []
+        self.release = asyncio.Event()
+
+    async def open(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+    async def send_batch(
+        self, messages: Sequence[OutgoingMessage]
+    ) -> list[DeliveryError | None]:
+        await self.release.wait()
+        self.sent.extend(message.address for message in messages)
+        return [None] * len(messages)
+
+
+async def _notifications(*channels: bool) -> None:
+    user = await User.create(email="a@example.com")
+    course = await Course.create(
+        code="noc24_cs01",
+        title="Algorithms",
+        url="https://example.com",
+        instructor="A",
+        institute="IIT",
+        nc_code="NC1",
+    )
+    announcement = await Announcement.create(
+        course=course,
+        title="Week 1",
+        date="15 January 2024",
+        content="Hello",
+        identity_hash="1" * 64,
+        content_hash="0" * 64,
+    )
+    subscription = await Subscription.create(user=user, course=course)
+    for index, is_active in enumerate(channels):
+        channel = await NotificationChannel.create(
+            user=user,
+            channel="email",
+            address=f"user{index}@example.com",
+            is_active=is_active,
+        )
+        await Notification.create(
+            user=user,
+            subscription=subscription,
+            announcement=announcement,
+            channel=channel,
+        )
+
+
+async def test_concurrent_workers_send_each_notification_once(db: None) -> None:
+    await _notifications(True, True)
+    sender = SlowSender()
+    workers = [DeliveryWorker(Settings(), {"email": sender}) for _ in range(2)]
+
+    first = asyncio.create_task(workers[0].deliver_due())
+    await asyncio.sleep(0.05)
+    second = asyncio.create_task(workers[1].deliver_due())
+    await asyncio.sleep(0.05)
+    sender.release.set()
+
+    assert await asyncio.gather(first, second) == [2, 0]
+    assert sorted(sender.sent) == ["user0@example.com", "user1@example.com"]
+    assert set(await Notification.all().values_list("status", flat=True)) == {
+        NotificationStatus.SENT
+    }
+
+
+async def test_inactive_channels_are_not_delivered(db: None) -> None:
+    await _notifications(True, False)
+    sender = SlowSender()
+    sender.release.set()
+
+    await DeliveryWorker(Settings(), {"email": sender}).deliver_due()
+
+    assert sender.sent == ["user0@example.com"]
+
+
+class FakeSMTP:
+    instances: ClassVar[list["FakeSMTP"]] = []
+    starttls = False
+    refuse = False
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        FakeSMTP.instances.append(self)
+        if self.refuse:
+            raise ConnectionRefusedError("connection refused")
+        self.logged_in = False
+        self.closed = False
+
+    def ehlo(self) -> None:
+        pass
+
+    def has_extn(self, name: str) -> bool:
+        return name == "starttls" and self.starttls
+
+    def login(self, username: str, password: str) -> None:
+        self.logged_in = True
+
+    def close(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture
+def fake_smtp(monkeypatch: pytest.MonkeyPatch) -> type[FakeSMTP]:
+    FakeSMTP.instances = []
+    monkeypatch.setattr(smtplib, "SMTP", FakeSMTP)
+    return FakeSMTP
+
+
+async def test_smtp_login_requires_starttls(fake_smtp: type[FakeSMTP]) -> None:
+    sender = SmtpSender("smtp.example.com", 587, "from@example.com", "user", "secret")
+
+    results = await sender.send_batch(MESSAGES)
+
+    assert all(result is not None and result.retryable for result in results)
+    (smtp,) = fake_smtp.instances
+    assert not smtp.logged_in
+    assert smtp.closed
+
+
+async def test_smtp_connect_failure_aborts_the_batch(
+    monkeypatch: pytest.MonkeyPatch, fake_smtp: type[FakeSMTP]
+) -> None:
+    monkeypatch.setattr(fake_smtp, "refuse", True)
+    sender = SmtpSender("smtp.example.com", 587, "from@example.com")
+
+    results = await sender.send_batch(MESSAGES)
+
+    assert len(fake_smtp.instances) == 1
+    assert len(results) == len(MESSAGES)
+    assert all(result is not None and result.retryable for result in results)
@@ -0,0 +1,89 @@
+import sqlite3
+from pathlib import Path
+
+from tortoise import Tortoise
+
+from app.core.config import Settings
+from app.core.database import close_database, init_database
+
+BASELINE_SCHEMA = Path(__file__).parent / "fixtures" / "baseline_schema.sql"
+
+SEED = """
+INSERT INTO users (id, email) VALUES (1, 'a@example.com');
+INSERT INTO courses (id, code, title, url, instructor, institute, nc_code)
+VALUES (1, 'noc24_cs01', 'Algorithms', 'https://example.com', 'A', 'IIT', 'NC1');
+INSERT INTO announcements (id, course_id, title, date, content, fetched_at)
+VALUES
+    (1, 1, 'Week 1', '15 January 2024', 'Hello', '2024-01-16 10:00:00'),
+    (2, 1, 'Week 1', '15 January 2024', 'Hello', '2024-01-16 11:00:00'),
+    (3, 1, 'Week 2', 'sometime', 'Again', '2024-01-23 10:00:00');
+INSERT INTO subscriptions (id, user_id, course_id) VALUES (1, 1, 1);
+INSERT INTO notifications (user_id, subscription_id, announcement_id)
+VALUES (1, 1, 1), (1, 1, 2), (1, 1, 3);
+"""
+
+
+def _baseline_database(path: Path) -> None:
+    with sqlite3.connect(path) as connection:
+        connection.executescript(BASELINE_SCHEMA.read_text())
+        connection.executescript(SEED)
+
+
+async def test_upgrades_baseline_database(tmp_path: Path) -> None:
+    path = tmp_path / "db.sqlite3"
+    _baseline_database(path)
+
+    await init_database(Settings(database_url=f"sqlite://{path}", debug=True))
+    await close_database()
+
+    with sqlite3.connect(path) as connection:
+        assert connection.execute("PRAGMA integrity_check").fetchall() == [("ok",)]
+        announcements = connection.execute(
+            'SELECT "id", "identity_hash", "published_at", "updated_at", '
+            '"fetched_at" FROM "announcements" ORDER BY "id"'
+        ).fetchall()
+        notifications = connection.execute(
+            'SELECT "announcement_id", "status" FROM "notifications" ORDER BY "id"'
+        ).fetchall()
+
+    # The duplicate of announcement 1 is merged into it, with its notification.
+    assert [row[0] for row in announcements] == [1, 3]
+    assert all(row[1] for row in announcements)
+    assert announcements[0][2] is not None
+    assert announcements[1][2] is None
+    assert all(row[3] == row[4] for row in announcements)
+    assert notifications == [(1, "sent"), (3, "sent")]
+
+
+async def test_upgrade_is_idempotent(tmp_path: Path) -> None:
+    path = tmp_path / "db.sqlite3"
+    _baseline_database(path)
+    settings = Settings(database_url=f"sqlite://{path}")
+
+    for _ in range(2):
+        await init_database(settings)
+        await close_database()
+
+    with sqlite3.connect(path) as connection:
+        assert connection.execute("PRAGMA integrity_check").fetchall() == [("ok",)]
+
+
+async def test_upgraded_database_has_every_model_column(tmp_path: Path) -> None:
+    path = tmp_path / "db.sqlite3"
+    _baseline_database(path)
+
+    await init_database(Settings(database_url=f"sqlite://{path}"))
+    expected = {
+        model._meta.db_table: set(model._meta.fields_db_projection.values())
+        for model in Tortoise.apps["models"].values()
+    }
+    await close_database()
+
+    with sqlite3.connect(path) as connection:
+        missing = {
+            table: columns
+            - {row[1] for row in connection.execute(f'PRAGMA table_info("{table}")')}
+            for table, columns in expected.items()
+        }
+    # A column added to an existing model needs a step in STEPS.
+    assert {table: columns for table, columns in missing.items() if columns} == {}
@@ -0,0 +1,63 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.core.pagination import PageRequest, paginate_values
+from app.models.announcement import Announcement
+from app.models.course import Course
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+# Two announcements share a date so the id tie-breaker is crossed too.
+DAYS = [3, None, 1, 3, None, 2, None]
+
+
+async def _announcements() -> list[tuple[int, datetime | None]]:
+    course = await Course.create(
+        code="noc24_cs01",
+        title="Algorithms",
+        url="https://example.com",
+        instructor="A",
+        institute="IIT",
+        nc_code="NC1",
+    )
+    rows = []
+    for index, day in enumerate(DAYS):
+        published_at = None if day is None else START + timedelta(days=day)
+        announcement = await Announcement.create(
+            course=course,
+            title=f"Week {index}",
+            date="",
+            content="",
+            identity_hash=f"{index:064x}",
+            content_hash="0" * 64,
+            published_at=published_at,
+        )
+        rows.append((announcement.id, published_at))
+    return rows
+
+
+@pytest.mark.parametrize("ordering", ["-published_at", "published_at"])
+async def test_nulls_come_last_across_pages(db: None, ordering: str) -> None:
+    rows = await _announcements()
+    descending = ordering.startswith("-")
+    dated = sorted(
+        (row for row in rows if row[1] is not None),
+        key=lambda row: (row[1], row[0]),
+        reverse=descending,
+    )
+    undated = sorted((row for row in rows if row[1] is None), reverse=descending)
+    seen: list[int] = []
+    cursor = None
+    while True:
+        page = await paginate_values(
+            Announcement.all(),
+            ordering,
+            PageRequest(limit=2, cursor=cursor),
+            ["id", "published_at"],
+        )
+        seen.extend(row["id"] for row in page.items)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    assert seen == [row[0] for row in [*dated, *undated]]
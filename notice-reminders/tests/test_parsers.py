@@ -0,0 +1,66 @@
+from pathlib import Path
+
+import pytest
+
+from app.scrapers.parsers import LxmlParser, SoupParser
+
+pytest.importorskip("lxml")
+
+PAGES = Path(__file__).parent / "fixtures" / "pages"
+
+
+def _page(name: str) -> str:
+    return (PAGES / name).read_text(encoding="utf-8")
+
+
+def test_search_results_match() -> None:
+    html = _page("search.html")
+
+    courses = SoupParser().parse_search_results(html)
+
+    assert LxmlParser().parse_search_results(html) == courses
+    assert [course.code for course in courses] == [
+        "noc24_cs57",
+        "cec24_cs10",
+        "noc24_ma12",
+        "imb24_mg05",
+    ]
+    assert courses[1].title == "Data Structures & Algorithms"
+
+
+@pytest.mark.parametrize("name", ["announcements.html", "announcements_malformed.html"])
+def test_announcements_match(name: str) -> None:
+    html = _page(name)
+
+    announcements = SoupParser().parse_announcements(html)
+
+    assert LxmlParser().parse_announcements(html) == announcements
+    assert announcements
+
+
+def test_announcement_edge_cases() -> None:
+    announcements = {
+        item.title: item
+        for item in LxmlParser().parse_announcements(_page("announcements.html"))
+    }
+
+    assert announcements["Week 4 assignment deadline extended"].published_at
+    assert announcements["Whitespace-only date"].date == ""
+    assert announcements["Script without a timestamp"].date == ""
+    assert announcements["No date paragraph"].date == "Unknown Date"
+    assert "₹1000" in announcements["Exam registration – reminder"].content
+
+
+def test_block_inside_paragraph_keeps_its_content() -> None:
+    html = _page("announcements_malformed.html")
+
+    first, second = LxmlParser().parse_announcements(html)
+
+    assert first.content.splitlines()[-1] == "Please check them before the exam."
+    assert second.date == "29 January 2024"
+
+
+@pytest.mark.parametrize("html", ["", "  \n"])
+def test_empty_page(html: str) -> None:
+    assert LxmlParser().parse_announcements(html) == []
+    assert LxmlParser().parse_search_results(html) == []
@@ -0,0 +1,113 @@
+import httpx
+
+from app.core.config import Settings
+from app.models.announcement import Announcement
+from app.models.course import Course
+from app.models.subscription import Subscription
+from app.models.user import User
+from app.poller import SubscriptionPoller
+from app.services.announcement_service import AnnouncementService
+from app.services.swayam_service import SwayamService
+from tests.upstream import AnnouncementsServer, mock_client
+
+
+async def _subscribe(user: User, code: str) -> Course:
+    course = await Course.create(
+        code=code,
+        title=code,
+        url=f"https://example.com/{code}",
+        instructor="A",
+        institute="IIT",
+        nc_code="NC1",
+    )
+    await Subscription.create(user=user, course=course)
+    return course
+
+
+def _poller(handler, concurrency: int = 4) -> SubscriptionPoller:
+    settings = Settings(poller_concurrency=concurrency)
+    swayam_service = SwayamService(settings)
+    swayam_service.scraper._client = mock_client(handler)
+    return SubscriptionPoller(settings, AnnouncementService(settings, swayam_service))
+
+
+def _make_due(poller: SubscriptionPoller) -> None:
+    for due in poller._queue:
+        due.at = 0.0
+
+
+async def test_due_courses_are_polled_as_one_batch(db: None) -> None:
+    user = await User.create(email="a@example.com")
+    healthy = await _subscribe(user, "noc24_cs01")
+    broken = await _subscribe(user, "noc24_cs02")
+    upstream = AnnouncementsServer(["Week 1"])
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if broken.code in request.url.path:
+            return httpx.Response(500)
+        return upstream(request)
+
+    poller = _poller(handler)
+    await poller._load_subscribed_courses()
+    _make_due(poller)
+    batch = poller._take_due()
+    assert sorted(batch) == sorted([healthy.id, broken.id])
+    assert poller.in_flight == 2
+
+    await poller._poll(batch)
+    assert poller.in_flight == 0
+    assert await Announcement.filter(course=healthy).count() == 1
+    assert poller._intervals[healthy.id] == poller.initial_interval * poller.SPEED_UP
+    assert poller._intervals[broken.id] == (
+        poller.initial_interval * poller.BACK_OFF * 2
+    )
+    assert len(poller._queue) == 2
+
+
+async def test_batches_are_capped_at_the_concurrency(db: None) -> None:
+    user = await User.create(email="a@example.com")
+    for index in range(3):
+        await _subscribe(user, f"noc24_cs0{index}")
+
+    poller = _poller(AnnouncementsServer(["Week 1"]), concurrency=2)
+    await poller._load_subscribed_courses()
+    _make_due(poller)
+    assert len(poller._take_due()) == 2
+    assert poller._take_due() == []
+
+
+async def test_resubscribed_course_is_polled_once(db: None) -> None:
+    user = await User.create(email="a@example.com")
+    course = await _subscribe(user, "noc24_cs01")
+    poller = _poller(AnnouncementsServer(["Week 1"]))
+    await poller._load_subscribed_courses()
+
+    await Subscription.filter(course=course).update(is_active=False)
+    await poller._load_subscribed_courses()
+    await Subscription.filter(course=course).update(is_active=True)
+    await poller._load_subscribed_courses()
+
+    # The entry from before the removal is still queued, but stale.
+    assert len(poller._queue) == 2
+    _make_due(poller)
+    assert poller._take_due() == [course.id]
+    assert poller._queue == []
+
+
+async def test_course_readded_while_polling_is_polled_once(db: None) -> None:
+    user = await User.create(email="a@example.com")
+    course = await _subscribe(user, "noc24_cs01")
+    poller = _poller(AnnouncementsServer(["Week 1"]))
+    await poller._load_subscribed_courses()
+    _make_due(poller)
+    batch = poller._take_due()
+
+    await Subscription.filter(course=course).update(is_active=False)
+    await poller._load_subscribed_courses()
+    await Subscription.filter(course=course).update(is_active=True)
+    await poller._load_subscribed_courses()
+    _make_due(poller)
+    assert poller._take_due() == []
+
+    await poller._poll(batch)
+    assert len(poller._queue) == 1
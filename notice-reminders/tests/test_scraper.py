@@ -0,0 +1,55 @@
+import httpx
+import pytest
+
+from app.scrapers import SwayamScraper
+from tests.upstream import AnnouncementsServer, mock_client
+
+
+async def test_validators_are_saved_only_when_asked() -> None:
+    scraper = SwayamScraper()
+    scraper._client = mock_client(AnnouncementsServer(["Week 1"]))
+
+    page = await scraper.get_announcements_if_changed("noc24_cs01")
+    assert page is not None
+    assert [item.title for item in page.announcements] == ["Week 1"]
+
+    # Not saved yet, e.g. because storing the announcements failed.
+    assert await scraper.get_announcements_if_changed("noc24_cs01") is not None
+
+    await scraper.save_validators(page)
+    assert await scraper.get_announcements_if_changed("noc24_cs01") is None
+
+
+def _not_found(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(404)
+
+
+def _unavailable(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(503)
+
+
+def _refused(request: httpx.Request) -> httpx.Response:
+    raise httpx.ConnectError("Connection refused", request=request)
+
+
+@pytest.mark.parametrize("nptel", [_not_found, _unavailable, _refused])
+async def test_failing_mirror_falls_back(nptel) -> None:
+    swayam2 = AnnouncementsServer(["Week 1"])
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.host == "onlinecourses.nptel.ac.in":
+            return nptel(request)
+        return swayam2(request)
+
+    scraper = SwayamScraper()
+    scraper._client = mock_client(handler)
+    announcements = await scraper.get_announcements("noc24_cs01")
+    assert [item.title for item in announcements] == ["Week 1"]
+    assert await scraper.host_store.get("noc24_cs01") == scraper.SWAYAM2_BASE_URL
+
+
+async def test_last_mirror_failure_is_raised() -> None:
+    scraper = SwayamScraper()
+    scraper._client = mock_client(_refused)
+    with pytest.raises(httpx.ConnectError):
+        await scraper.get_announcements("noc24_cs01")
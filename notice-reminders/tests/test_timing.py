@@ -0,0 +1,21 @@
+from tortoise.transactions import in_transaction
+
+from app.core.metrics import DB_QUERIES
+from app.core.timing import RequestTimings, _current, instrument_queries
+from app.models.course import Course
+
+
+async def test_queries_are_counted_and_timed_once(db: None) -> None:
+    instrument_queries()
+    instrument_queries()
+    timings = RequestTimings()
+    token = _current.set(timings)
+    before = DB_QUERIES.total()
+    try:
+        async with in_transaction():
+            await Course.filter(code="noc24_cs01").exists()
+    finally:
+        _current.reset(token)
+
+    assert DB_QUERIES.total() - before == 1
+    assert timings.entries["db"][0] == 1
@@ -0,0 +1,34 @@
+"""Canned upstream responses for tests that fetch through the scraper."""
+
+import httpx
+
+
+def announcements_page(titles: list[str]) -> str:
+    return "".join(
+        f'<h2><span class="gcb-announcement-title">{title}</span></h2>'
+        "<p>15 January 2024</p>"
+        f'<p class="gcb-announcement-content">About {title}</p>'
+        for title in titles
+    )
+
+
+class AnnouncementsServer:
+    """Serves the current version of every announcements page.
+
+    Each version gets its own ETag, and a matching If-None-Match gets a 304.
+    """
+
+    def __init__(self, titles: list[str]) -> None:
+        self.titles = titles
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        etag = f'"{len(self.titles)}"'
+        if request.headers.get("If-None-Match") == etag:
+            return httpx.Response(304)
+        return httpx.Response(
+            200, text=announcements_page(self.titles), headers={"ETag": etag}
+        )
+
+
+def mock_client(handler) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
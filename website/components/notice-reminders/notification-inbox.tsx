@@ -1,6 +1,10 @@
 "use client";
 
-import { useQuery, useMutation, useQueryClient } from "@tanstack/react-query";
+import {
+  useInfiniteQuery,
+  useMutation,
+  useQueryClient,
+} from "@tanstack/react-query";
 import { listNotifications, markNotificationRead } from "@/lib/api";
 import type { Notification } from "@/lib/types";
 import {
@@ -19,17 +23,23 @@ import {
   Circle,
   Inbox,
 } from "lucide-react";
+import { useMemo } from "react";
 
 export function NotificationInbox() {
   const queryClient = useQueryClient();
 
-  const {
-    data: notifications = [],
-    isLoading,
-  } = useQuery({
-    queryKey: ["notifications"],
-    queryFn: () => listNotifications(),
-  });
+  const { data, isLoading, hasNextPage, fetchNextPage, isFetchingNextPage } =
+    useInfiniteQuery({
+      queryKey: ["notifications"],
+      queryFn: ({ pageParam }) => listNotifications({ cursor: pageParam }),
+      initialPageParam: null as string | null,
+      getNextPageParam: (lastPage) => lastPage.nextCursor,
+    });
+
+  const notifications = useMemo(
+    () => data?.pages.flatMap((page) => page.items) ?? [],
+    [data]
+  );
 
   const markReadMutation = useMutation({
     mutationFn: markNotificationRead,
@@ -66,7 +76,9 @@ export function NotificationInbox() {
         </CardTitle>
         <CardDescription>
           {notifications.length > 0
-            ? `${notifications.length} notification${notifications.length > 1 ? "s" : ""} total`
+            ? hasNextPage
+              ? `Showing the latest ${notifications.length} notifications`
+              : `${notifications.length} notification${notifications.length > 1 ? "s" : ""} total`
             : "No notifications yet"}
         </CardDescription>
       </CardHeader>
@@ -147,6 +159,20 @@ export function NotificationInbox() {
                 )}
               </div>
             ))}
+            {hasNextPage && (
+              <Button
+                variant="ghost"
+                size="sm"
+                className="w-full"
+                onClick={() => fetchNextPage()}
+                disabled={isFetchingNextPage}
+              >
+                {isFetchingNextPage && (
+                  <Loader2 className="w-3 h-3 animate-spin mr-1" />
+                )}
+                Load more
+              </Button>
+            )}
           </div>
         )}
       </CardContent>
@@ -1,6 +1,11 @@
 "use client";
 
-import { useQuery, useMutation, useQueryClient } from "@tanstack/react-query";
+import {
+  useQuery,
+  useInfiniteQuery,
+  useMutation,
+  useQueryClient,
+} from "@tanstack/react-query";
 import {
   listSubscriptions,
   deleteSubscription,
@@ -28,21 +33,46 @@ import {
   Calendar,
 } from "lucide-react";
 import Link from "next/link";
-import { useState, useCallback } from "react";
+import { useState, useCallback, useMemo } from "react";
+
+const ANNOUNCEMENT_PREVIEW_COUNT = 3;
+
+// One page of subscriptions plus the courses they refer to, so course details
+// are fetched for the subscriptions on screen rather than the whole catalog.
+async function listSubscriptionsWithCourses(cursor: string | null) {
+  const page = await listSubscriptions({ cursor });
+  const ids = [...new Set(page.items.map((sub) => sub.course_id))];
+  const courses = ids.length
+    ? (await listCourses({ ids, limit: ids.length })).items
+    : [];
+  return { ...page, courses };
+}
 
 export function SubscriptionManager() {
   const queryClient = useQueryClient();
   const [expandedSub, setExpandedSub] = useState<number | null>(null);
 
-  const { data: subscriptions = [], isLoading: loadingSubs } = useQuery({
+  const {
+    data,
+    isLoading: loadingSubs,
+    hasNextPage,
+    fetchNextPage,
+    isFetchingNextPage,
+  } = useInfiniteQuery({
     queryKey: ["subscriptions"],
-    queryFn: () => listSubscriptions(),
+    queryFn: ({ pageParam }) => listSubscriptionsWithCourses(pageParam),
+    initialPageParam: null as string | null,
+    getNextPageParam: (lastPage) => lastPage.nextCursor,
   });
 
-  const { data: courses = [] } = useQuery({
-    queryKey: ["courses"],
-    queryFn: listCourses,
-  });
+  const subscriptions = useMemo(
+    () => data?.pages.flatMap((page) => page.items) ?? [],
+    [data]
+  );
+  const courses = useMemo(
+    () => data?.pages.flatMap((page) => page.courses) ?? [],
+    [data]
+  );
 
   const deleteMutation = useMutation({
     mutationFn: deleteSubscription,
@@ -81,7 +111,7 @@ export function SubscriptionManager() {
         </CardTitle>
         <CardDescription>
           {subscriptions.length > 0
-            ? `Tracking ${subscriptions.length} course${subscriptions.length > 1 ? "s" : ""}`
+            ? `Tracking ${subscriptions.length}${hasNextPage ? "+" : ""} course${subscriptions.length > 1 || hasNextPage ? "s" : ""}`
             : "No active subscriptions"}
         </CardDescription>
       </CardHeader>
@@ -188,6 +218,20 @@ export function SubscriptionManager() {
                 </div>
               );
             })}
+            {hasNextPage && (
+              <Button
+                variant="ghost"
+                size="sm"
+                className="w-full"
+                onClick={() => fetchNextPage()}
+                disabled={isFetchingNextPage}
+              >
+                {isFetchingNextPage && (
+                  <Loader2 className="w-3.5 h-3.5 animate-spin mr-1.5" />
+                )}
+                Load more
+              </Button>
+            )}
           </div>
         )}
       </CardContent>
@@ -196,10 +240,13 @@ export function SubscriptionManager() {
 }
 
 function AnnouncementPreview({ courseCode }: { courseCode: string }) {
-  const { data: announcements = [], isLoading } = useQuery({
-    queryKey: ["announcements", courseCode],
-    queryFn: () => listAnnouncements(courseCode),
+  // Only the newest few are shown, so only they are fetched.
+  const { data, isLoading } = useQuery({
+    queryKey: ["announcements", courseCode, ANNOUNCEMENT_PREVIEW_COUNT],
+    queryFn: () =>
+      listAnnouncements(courseCode, { limit: ANNOUNCEMENT_PREVIEW_COUNT }),
   });
+  const recent = data?.items ?? [];
 
   if (isLoading) {
     return (
@@ -210,8 +257,6 @@ function AnnouncementPreview({ courseCode }: { courseCode: string }) {
     );
   }
 
-  const recent = announcements.slice(0, 3);
-
   if (recent.length === 0) {
     return (
       <p className="text-sm text-muted-foreground py-1">
@@ -248,10 +293,9 @@ function AnnouncementPreview({ courseCode }: { courseCode: string }) {
           )}
         </div>
       ))}
-      {announcements.length > 3 && (
+      {data?.nextCursor && (
         <p className="text-xs text-muted-foreground">
-          +{announcements.length - 3} more announcement
-          {announcements.length - 3 > 1 ? "s" : ""}
+          More announcements available
         </p>
       )}
     </div>
@@ -11,6 +11,8 @@ import type {
   Notification,
   OtpRequestResponse,
   AuthStatus,
+  Page,
+  PageParams,
 } from "./types";
 
 const API_BASE = process.env.NEXT_PUBLIC_API_URL || "http://localhost:8000";
@@ -25,10 +27,10 @@ class APIError extends Error {
   }
 }
 
-async function request<T>(
+async function send(
   endpoint: string,
   options: RequestInit = {}
-): Promise<T> {
+): Promise<Response> {
   const url = `${API_BASE}${endpoint}`;
   const res = await fetch(url, {
     ...options,
@@ -44,6 +46,15 @@ async function request<T>(
     throw new APIError(res.status, error.detail || "Request failed");
   }
 
+  return res;
+}
+
+async function request<T>(
+  endpoint: string,
+  options: RequestInit = {}
+): Promise<T> {
+  const res = await send(endpoint, options);
+
   // Handle 204 No Content
   if (res.status === 204) {
     return undefined as T;
@@ -52,6 +63,23 @@ async function request<T>(
   return res.json();
 }
 
+// Fetch one page of a list endpoint. The cursor for the next page comes from
+// the X-Next-Cursor header; callers fetch it only when it is needed.
+async function requestPage<T>(
+  endpoint: string,
+  { cursor, limit }: PageParams = {},
+  params: URLSearchParams = new URLSearchParams()
+): Promise<Page<T>> {
+  if (cursor) params.set("cursor", cursor);
+  if (limit) params.set("limit", String(limit));
+  const query = params.toString();
+  const res = await send(query ? `${endpoint}?${query}` : endpoint);
+  return {
+    items: (await res.json()) as T[],
+    nextCursor: res.headers.get("X-Next-Cursor"),
+  };
+}
+
 export async function getUser(userId: number): Promise<User> {
   return request<User>(`/users/${userId}`);
 }
@@ -73,8 +101,12 @@ export async function deleteUser(userId: number): Promise<void> {
 }
 
 // Courses
-export async function listCourses(): Promise<Course[]> {
-  return request<Course[]>("/courses");
+export async function listCourses(
+  page: PageParams & { ids?: number[] } = {}
+): Promise<Page<Course>> {
+  const params = new URLSearchParams();
+  for (const id of page.ids ?? []) params.append("id", String(id));
+  return requestPage<Course>("/courses", page, params);
 }
 
 export async function getCourse(courseCode: string): Promise<Course> {
@@ -83,10 +115,12 @@ export async function getCourse(courseCode: string): Promise<Course> {
 
 // Announcements
 export async function listAnnouncements(
-  courseCode: string
-): Promise<Announcement[]> {
-  return request<Announcement[]>(
-    `/courses/${encodeURIComponent(courseCode)}/announcements`
+  courseCode: string,
+  page: PageParams = {}
+): Promise<Page<Announcement>> {
+  return requestPage<Announcement>(
+    `/courses/${encodeURIComponent(courseCode)}/announcements`,
+    page
   );
 }
 
@@ -105,8 +139,10 @@ export async function createSubscription(
   });
 }
 
-export async function listSubscriptions(): Promise<Subscription[]> {
-  return request<Subscription[]>(`/subscriptions`);
+export async function listSubscriptions(
+  page: PageParams = {}
+): Promise<Page<Subscription>> {
+  return requestPage<Subscription>(`/subscriptions`, page);
 }
 
 export async function deleteSubscription(subscriptionId: number): Promise<void> {
@@ -133,8 +169,10 @@ export async function listUserChannels(
 }
 
 // Notifications
-export async function listNotifications(): Promise<Notification[]> {
-  return request<Notification[]>("/notifications");
+export async function listNotifications(
+  page: PageParams = {}
+): Promise<Page<Notification>> {
+  return requestPage<Notification>("/notifications", page);
 }
 
 
@@ -46,6 +46,7 @@ export interface SubscriptionCreate {
 
 // ─── Notification Channels ──────────────────────────────
 export type ChannelType = "email" | "telegram";
+export type DigestMode = "immediate" | "hourly" | "daily";
 
 export interface NotificationChannel {
   id: number;
@@ -53,6 +54,7 @@ export interface NotificationChannel {
   channel: ChannelType;
   address: string;
   is_active: boolean;
+  digest: DigestMode;
   created_at: string;
 }
 
@@ -60,6 +62,7 @@ export interface NotificationChannelCreate {
   channel: ChannelType;
   address: string;
   is_active?: boolean;
+  digest?: DigestMode;
 }
 
 // ─── Auth ────────────────────────────────────────────────
@@ -81,6 +84,7 @@ export interface Announcement {
   title: string;
   date: string;
   content: string;
+  published_at: string | null;
   fetched_at: string;
 }
 
@@ -94,3 +98,15 @@ export interface Notification {
   sent_at: string;
   is_read: boolean;
 }
+
+// ─── Pagination ─────────────────────────────────────────
+// One page of a list endpoint; nextCursor is null on the last page.
+export interface Page<T> {
+  items: T[];
+  nextCursor: string | null;
+}
+
+export interface PageParams {
+  cursor?: string | null;
+  limit?: number;
+}